@@ -6,7 +6,7 @@ from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any, Literal
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class MessagePart:
     """
     Represents a single message part for ``/session/{id}/messages``.
@@ -25,7 +25,7 @@ class MessagePart:
     meta: Mapping[str, Any] | None = None
     file_field: str | None = None
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class AcontextMessage:
     """
     Represents an Acontext-format message payload.
@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from typing import BinaryIO
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class FileUpload:
     """
     Represents a file payload for multipart requests.
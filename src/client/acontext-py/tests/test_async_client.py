@@ -13,9 +13,11 @@ from acontext.messages import build_acontext_message
 from acontext.errors import APIError, TransportError
 
 
+_REQ = httpx.Request("GET", "https://api.acontext.test/resource")
+
+
 def make_response(status: int, payload: Dict[str, Any]) -> httpx.Response:
-    request = httpx.Request("GET", "https://api.acontext.test/resource")
-    return httpx.Response(status, json=payload, request=request)
+    return httpx.Response(status, json=payload, request=_REQ)
 
 
 @pytest_asyncio.fixture
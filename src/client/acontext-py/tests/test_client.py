@@ -1,5 +1,5 @@
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import FrozenInstanceError, asdict, dataclass
 from typing import Any, Dict
 from unittest.mock import patch
 
@@ -11,9 +11,11 @@ from acontext.messages import build_acontext_message  # noqa: E402
 from acontext.errors import APIError, TransportError  # noqa: E402
 
 
+_REQ = httpx.Request("GET", "https://api.acontext.test/resource")
+
+
 def make_response(status: int, payload: Dict[str, Any]) -> httpx.Response:
-    request = httpx.Request("GET", "https://api.acontext.test/resource")
-    return httpx.Response(status, json=payload, request=request)
+    return httpx.Response(status, json=payload, request=_REQ)
 
 
 @pytest.fixture
@@ -44,6 +46,19 @@ def test_build_acontext_message_with_meta() -> None:
     }
 
 
+def test_message_and_upload_dataclasses_are_frozen() -> None:
+    message = build_acontext_message(role="user", parts=["hi"])
+    upload = FileUpload(filename="a.txt", content=b"a")
+
+    with pytest.raises(FrozenInstanceError):
+        message.role = "assistant"
+    with pytest.raises(FrozenInstanceError):
+        message.parts[0].text = "bye"
+    with pytest.raises(FrozenInstanceError):
+        upload.filename = "b.txt"
+    assert not hasattr(message, "__dict__")
+
+
 def test_handle_response_returns_data() -> None:
     resp = make_response(200, {"code": 200, "data": {"ok": True}})
     data = AcontextClient._handle_response(resp, unwrap=True)
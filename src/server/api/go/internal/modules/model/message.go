@@ -5,6 +5,7 @@ import (
 
 	"github.com/google/uuid"
 	"gorm.io/datatypes"
+	"gorm.io/gorm"
 )
 
 // MessageFormat represents the format for message input/output conversion
@@ -18,7 +19,7 @@ const (
 
 type Message struct {
 	ID        uuid.UUID  `gorm:"type:uuid;default:gen_random_uuid();primaryKey" json:"id"`
-	SessionID uuid.UUID  `gorm:"type:uuid;not null;index;index:idx_session_created,priority:1" json:"session_id"`
+	SessionID uuid.UUID  `gorm:"type:uuid;not null;index:idx_session_created,priority:1" json:"session_id"`
 	ParentID  *uuid.UUID `gorm:"type:uuid;index" json:"parent_id"`
 	Parent    *Message   `gorm:"foreignKey:ParentID;references:ID;constraint:OnDelete:CASCADE,OnUpdate:CASCADE;" json:"-"`
 	Children  []Message  `gorm:"foreignKey:ParentID;constraint:OnDelete:CASCADE,OnUpdate:CASCADE;" json:"-"`
@@ -46,6 +47,18 @@ type Message struct {
 
 func (Message) TableName() string { return "messages" }
 
+// BeforeCreate gives new messages a time-ordered UUIDv7, so inserts append to the primary key index
+func (m *Message) BeforeCreate(tx *gorm.DB) error {
+	if m.ID == uuid.Nil {
+		id, err := uuid.NewV7()
+		if err != nil {
+			return err
+		}
+		m.ID = id
+	}
+	return nil
+}
+
 type Part struct {
 	// "text" | "image" | "audio" | "video" | "file" | "tool-call" | "tool-result" | "data"
 	Type string `json:"type"`
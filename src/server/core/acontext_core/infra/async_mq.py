@@ -1,16 +1,27 @@
 # FIXME: mq may be closed after a long time idle, around 2 hours!
 import os
 import asyncio
-import json
+import functools
 import traceback
+import orjson
 from enum import StrEnum
 from pydantic import ValidationError, BaseModel
+from pydantic_core import SchemaValidator
 from dataclasses import dataclass, field
 from typing import Callable, Awaitable, Any, Dict, Optional, List, Set, Tuple
 from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator
 
 from aio_pika import connect_robust, ExchangeType, Message
-from aio_pika.abc import AbstractConnection, AbstractChannel, AbstractQueue
+from aio_pika.abc import (
+    AbstractConnection,
+    AbstractChannel,
+    AbstractExchange,
+    AbstractQueue,
+)
+from aio_pika.exceptions import ChannelInvalidStateError, ChannelNotFoundEntity
 
 from ..env import LOG, DEFAULT_CORE_CONFIG, bound_logging_vars
 from ..util.handler_spec import check_handler_function_sanity, get_handler_body_type
@@ -40,6 +51,47 @@ class SpecialHandler(StrEnum):
 LOGGING_FIELDS = {"project_id", "session_id"}
 
 
+def _logging_value(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+class _LazyTraceback:
+    """Format an exception traceback only when a log handler renders it"""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+    def __str__(self) -> str:
+        return "".join(traceback.format_exception(self.exc))
+
+    __repr__ = __str__
+    __structlog__ = __str__
+
+
+def _encode_body(body: str | bytes | dict) -> bytes:
+    """Encode a publish body to bytes, serializing dicts with orjson"""
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return orjson.dumps(body)
+
+
+def _log_publish_failure(
+    exchange_name: str, routing_key: str, fut: asyncio.Future
+) -> None:
+    if fut.cancelled() or fut.exception() is None:
+        return
+    LOG.error(
+        "Failed to publish message to exchange: %s, routing_key: %s, error: %s",
+        exchange_name,
+        routing_key,
+        fut.exception(),
+    )
+
+
 def _is_otel_enabled() -> bool:
     """Check if OpenTelemetry tracing is enabled"""
     try:
@@ -153,7 +205,7 @@ def _create_process_span(
 def _create_publish_span_and_headers(
     exchange_name: str,
     routing_key: str,
-    body: str,
+    body: bytes,
 ) -> Tuple[Optional[Any], Dict[str, Any]]:
     """
     Create a span for message publishing and inject trace context into headers.
@@ -171,7 +223,7 @@ def _create_publish_span_and_headers(
         from ..telemetry.otel import create_mq_publish_span
         
         span = create_mq_publish_span(exchange_name, routing_key)
-        span.set_attribute("messaging.message_payload_size_bytes", len(body.encode("utf-8")))
+        span.set_attribute("messaging.message_payload_size_bytes", len(body))
         
         # Inject trace context into message headers for trace propagation
         ctx = trace.set_span_in_context(span)
@@ -200,6 +252,90 @@ def _record_span_exception(span: Optional[Any], exception: Exception) -> None:
             pass
 
 
+class MessageAckBatcher:
+    """
+    Coalesce acks of one consumer channel into basic.ack(multiple=True) frames
+
+    Deliveries are tracked in delivery-tag order. A flush acks the longest
+    prefix of settled deliveries with a single multiple ack on its highest
+    successful message; successes stuck behind a still-running delivery are
+    acked one by one so they keep releasing prefetch slots.
+    """
+
+    _PENDING = object()
+    _SETTLED = object()
+
+    def __init__(self, batch_size: int, interval_ms: int):
+        self.batch_size = batch_size
+        self.interval_s = interval_ms / 1000
+        self._deliveries: Dict[int, Any] = {}
+        self._unflushed = 0
+        self._lock = asyncio.Lock()
+
+    def track(self, message: Message) -> None:
+        self._deliveries[message.delivery_tag] = self._PENDING
+
+    def settle(self, message: Message) -> None:
+        """Mark a delivery that was already rejected (or acked) on its own"""
+        if message.delivery_tag in self._deliveries:
+            self._deliveries[message.delivery_tag] = self._SETTLED
+            # counted so run() prunes it even if nothing is acked after it
+            self._unflushed += 1
+
+    async def ack(self, message: Message) -> None:
+        if message.delivery_tag not in self._deliveries:
+            await message.ack()
+            return
+        self._deliveries[message.delivery_tag] = message
+        self._unflushed += 1
+        if self._unflushed >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            self._unflushed = 0
+            last_ready: Optional[Message] = None
+            blocked = False
+            for tag, state in list(self._deliveries.items()):
+                if state is self._PENDING:
+                    blocked = True
+                    continue
+                if not blocked:
+                    del self._deliveries[tag]
+                    if state is not self._SETTLED:
+                        last_ready = state
+                elif state is not self._SETTLED:
+                    self._deliveries[tag] = self._SETTLED
+                    await state.ack()
+            if last_ready is not None:
+                await last_ready.ack(multiple=True)
+
+    @asynccontextmanager
+    async def process(self, message: Message) -> AsyncGenerator[Message, None]:
+        """Like message.process(requeue=False, ignore_processed=True), but acks are batched"""
+        try:
+            yield message
+        except BaseException:
+            if not message.processed:
+                try:
+                    await message.reject(requeue=False)
+                except ChannelInvalidStateError:
+                    LOG.warning("Reject is not sent since channel is closed")
+            self.settle(message)
+            raise
+        if message.processed:
+            self.settle(message)
+        else:
+            await self.ack(message)
+
+    async def run(self) -> None:
+        """Periodically flush until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval_s)
+            if self._unflushed:
+                await self.flush()
+
+
 @dataclass
 class ConsumerConfigData:
     """Configuration for a single consumer"""
@@ -212,6 +348,7 @@ class ConsumerConfigData:
     auto_delete: bool = False
     # Configuration
     prefetch_count: int = DEFAULT_CORE_CONFIG.mq_global_qos
+    max_concurrency: Optional[int] = None  # defaults to prefetch_count
     message_ttl_seconds: int = DEFAULT_CORE_CONFIG.mq_default_message_ttl_seconds
     timeout: float = DEFAULT_CORE_CONFIG.mq_consumer_handler_timeout
     max_retries: int = DEFAULT_CORE_CONFIG.mq_default_max_retries
@@ -221,6 +358,9 @@ class ConsumerConfigData:
     dlx_ttl_days: int = DEFAULT_CORE_CONFIG.mq_default_dlx_ttl_days
     use_dlx_ex_rk: Optional[tuple[str, str]] = None
     dlx_suffix: str = "dead"
+    # Ack batching
+    ack_batch_size: int = DEFAULT_CORE_CONFIG.mq_ack_batch_size
+    ack_interval_ms: int = DEFAULT_CORE_CONFIG.mq_ack_interval_ms
 
 
 @dataclass
@@ -231,9 +371,18 @@ class ConsumerConfig(ConsumerConfigData):
         Callable[[BaseModel, Message], Awaitable[Any]] | SpecialHandler
     ] = field(default=None)
     body_pydantic_type: Optional[BaseModel] = field(default=None)
+    body_validator: Optional[SchemaValidator] = field(
+        default=None, init=False, repr=False
+    )
+    retry_delays: Tuple[float, ...] = field(default=(), init=False, repr=False)
+    logging_fields: Tuple[str, ...] = field(default=(), init=False, repr=False)
 
     def __post_init__(self):
         assert self.handler is not None, "Consumer Handler can not be None"
+        # Quadratic backoff for attempts 1..max_retries+1
+        self.retry_delays = tuple(
+            self.retry_delay * (i * i) for i in range(1, self.max_retries + 2)
+        )
         if isinstance(self.handler, SpecialHandler):
             return
         _, eil = check_handler_function_sanity(self.handler).unpack()
@@ -244,11 +393,23 @@ class ConsumerConfig(ConsumerConfigData):
 
         self.body_pydantic_type = get_handler_body_type(self.handler)
         assert self.body_pydantic_type is not None, "Handler body type can not be None"
+        self.body_validator = self.body_pydantic_type.__pydantic_validator__
+        self.logging_fields = tuple(
+            k for k in LOGGING_FIELDS if k in self.body_pydantic_type.model_fields
+        )
 
 
 @dataclass
 class ConnectionConfig:
-    """MQ connection configuration"""
+    """
+    MQ connection configuration
+
+    heartbeat bounds dead-peer detection: lower values notice a dropped broker
+    sooner but cost a frame per interval and risk false disconnects when the
+    loop is stalled by long CPU phases. Nagle is not a concern here: asyncio
+    sets TCP_NODELAY on every TCP stream it opens, so small AMQP frames
+    (acks, publishes) are written out immediately.
+    """
 
     url: str
     connection_name: str = DEFAULT_CORE_CONFIG.mq_connection_name
@@ -275,9 +436,18 @@ class AsyncSingleThreadMQConsumer:
         self.connection: Optional[AbstractConnection] = None
         self.consumers: Dict[str, ConsumerConfig] = {}
         self._publish_channle: Optional[AbstractChannel] = None
+        self._exchange_cache: Dict[str, AbstractExchange] = {}
+        self.publish_batch_max = DEFAULT_CORE_CONFIG.mq_publish_batch_max
+        self.publish_queue_max = DEFAULT_CORE_CONFIG.mq_publish_queue_max
+        self._publish_queue: Optional[asyncio.Queue] = None
+        self._publish_flush_task: Optional[asyncio.Task] = None
         self._consumer_loop_tasks: List[asyncio.Task] = []
         self._shutdown_event = asyncio.Event()
+        # Strong refs: the event loop only keeps weak references to tasks
         self._processing_tasks: Set[asyncio.Task] = set()
+        # (exchange_name, queue_name) already declared on the broker by this process
+        self._declared_topologies: Set[Tuple[str, str]] = set()
+        self._validator_pool: Optional[ThreadPoolExecutor] = None
         self.__running = False
 
     @property
@@ -298,7 +468,10 @@ class AsyncSingleThreadMQConsumer:
                 heartbeat=self.connection_config.heartbeat,
                 blocked_connection_timeout=self.connection_config.blocked_connection_timeout,
             )
-            self._publish_channle = await self.connection.channel()
+            self._publish_channle = await self.connection.channel(
+                publisher_confirms=True
+            )
+            self._exchange_cache.clear()
             LOG.info(
                 f"Connected to MQ (connection: {self.connection_config.connection_name})"
             )
@@ -308,9 +481,16 @@ class AsyncSingleThreadMQConsumer:
 
     async def disconnect(self) -> None:
         """Close connection to MQ"""
+        flush_task = self._publish_flush_task
+        if flush_task and not flush_task.done():
+            flush_task.cancel()
+            if flush_task.get_loop() is asyncio.get_running_loop():
+                await asyncio.gather(flush_task, return_exceptions=True)
+        self._publish_flush_task = None
         if self._publish_channle and not self._publish_channle.is_closed:
             await self._publish_channle.close()
             self._publish_channle = None
+        self._exchange_cache.clear()
         if self.connection and not self.connection.is_closed:
             await self.connection.close()
             self.connection = None
@@ -334,14 +514,18 @@ class AsyncSingleThreadMQConsumer:
         self,
         config: ConsumerConfig,
         message: Message,
+        ack_batcher: MessageAckBatcher,
         parent_context: Optional[Any] = None,
     ) -> None:
         """Process a single message with retry logic"""
         # Create span for message processing if OpenTelemetry is enabled
         span, process_context = _create_process_span(config, message, parent_context)
-        
+        handler = config.handler
+        validator = config.body_validator
+        timeout = config.timeout
+
         try:
-            async with message.process(requeue=False, ignore_processed=True):
+            async with ack_batcher.process(message):
                 retry_count = 0
                 max_retries = config.max_retries
 
@@ -349,12 +533,12 @@ class AsyncSingleThreadMQConsumer:
                     try:
                         # process the body to json
                         try:
-                            payload = json.loads(message.body.decode("utf-8"))
-                            validated_body = config.body_pydantic_type.model_validate(
-                                payload
+                            validated_body = await self._validate_body(
+                                validator, message.body
                             )
                             _logging_vars = {
-                                k: payload.get(k, None) for k in LOGGING_FIELDS
+                                k: _logging_value(getattr(validated_body, k))
+                                for k in config.logging_fields
                             }
                             with bound_logging_vars(
                                 queue_name=config.queue_name, **_logging_vars
@@ -368,8 +552,8 @@ class AsyncSingleThreadMQConsumer:
                                     try:
                                         _start_s = perf_counter()
                                         await asyncio.wait_for(
-                                            config.handler(validated_body, message),
-                                            timeout=config.timeout,
+                                            handler(validated_body, message),
+                                            timeout=timeout,
                                         )
                                         _end_s = perf_counter()
                                     finally:
@@ -377,20 +561,23 @@ class AsyncSingleThreadMQConsumer:
                                 else:
                                     _start_s = perf_counter()
                                     await asyncio.wait_for(
-                                        config.handler(validated_body, message),
-                                        timeout=config.timeout,
+                                        handler(validated_body, message),
+                                        timeout=timeout,
                                     )
                                     _end_s = perf_counter()
                                 
                                 LOG.debug(
-                                    f"Queue: {config.queue_name} processed in {_end_s - _start_s:.4f}s"
+                                    "Queue: %s processed in %.4fs",
+                                    config.queue_name,
+                                    _end_s - _start_s,
                                 )
                                 if span:
                                     span.set_attribute("mq.processing_time_seconds", _end_s - _start_s)
                         except ValidationError as e:
                             LOG.error(
-                                f"Message validation failed - queue: {config.queue_name}, "
-                                f"error: {str(e)}"
+                                "Message validation failed - queue: %s, error: %s",
+                                config.queue_name,
+                                e,
                             )
                             if span:
                                 _record_span_exception(span, e)
@@ -399,7 +586,7 @@ class AsyncSingleThreadMQConsumer:
                             return
                         except asyncio.TimeoutError:
                             timeout_error = TimeoutError(
-                                f"Handler timeout after {config.timeout}s - queue: {config.queue_name}"
+                                f"Handler timeout after {timeout}s - queue: {config.queue_name}"
                             )
                             if span:
                                 _record_span_exception(span, timeout_error)
@@ -414,15 +601,18 @@ class AsyncSingleThreadMQConsumer:
 
                     except Exception as e:
                         retry_count += 1
-                        _wait_for = config.retry_delay * (retry_count**2)
+                        _wait_for = config.retry_delays[retry_count - 1]
 
                         if retry_count <= max_retries:
                             LOG.warning(
-                                f"Message processing unknown error - queue: {config.queue_name}, "
-                                f"attempt: {retry_count}/{config.max_retries}, "
-                                f"retry after {_wait_for}s, "
-                                f"error: {str(e)}.",
-                                extra={"traceback": traceback.format_exc()},
+                                "Message processing unknown error - queue: %s, "
+                                "attempt: %d/%d, retry after %ss, error: %s.",
+                                config.queue_name,
+                                retry_count,
+                                max_retries,
+                                _wait_for,
+                                e,
+                                extra={"traceback": _LazyTraceback(e)},
                             )
                             if span:
                                 span.set_attribute("mq.retry_count", retry_count)
@@ -430,9 +620,10 @@ class AsyncSingleThreadMQConsumer:
                             await asyncio.sleep(_wait_for)  # Exponential backoff
                         else:
                             LOG.error(
-                                f"Message processing failed permanently - queue: {config.queue_name}, "
-                                f"error: {str(e)}",
-                                extra={"traceback": traceback.format_exc()},
+                                "Message processing failed permanently - queue: %s, error: %s",
+                                config.queue_name,
+                                e,
+                                extra={"traceback": _LazyTraceback(e)},
                             )
                             if span:
                                 _record_span_exception(span, e)
@@ -446,16 +637,29 @@ class AsyncSingleThreadMQConsumer:
             if span:
                 span.end()
 
+    async def _validate_body(self, validator: SchemaValidator, body: bytes) -> Any:
+        """Validate inline, or in the validator pool for large bodies to keep the loop free"""
+        if len(body) < DEFAULT_CORE_CONFIG.mq_validator_offload_bytes:
+            return validator.validate_json(body)
+        if self._validator_pool is None:
+            self._validator_pool = ThreadPoolExecutor(
+                max_workers=DEFAULT_CORE_CONFIG.mq_validator_threads,
+                thread_name_prefix="mq-validator",
+            )
+        return await asyncio.get_running_loop().run_in_executor(
+            self._validator_pool, validator.validate_json, body
+        )
+
     def cleanup_message_task(self, task: asyncio.Task) -> None:
         try:
             task.result()
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            LOG.error(f"Message task unknown error: {e}")
+            LOG.error("Message task unknown error: %s", e)
         finally:
             self._processing_tasks.discard(task)
-            LOG.debug(f"#Current Processing Tasks: {len(self._processing_tasks)}")
+            LOG.debug("#Current Processing Tasks: %d", len(self._processing_tasks))
 
     async def _special_queue(self, config: ConsumerConfig) -> str:
         if config.handler is SpecialHandler.NO_PROCESS:
@@ -471,18 +675,18 @@ class AsyncSingleThreadMQConsumer:
 
         while not self._shutdown_event.is_set():
             consumer_channel: AbstractChannel | None = None
+            ack_batcher: MessageAckBatcher | None = None
+            ack_flush_task: asyncio.Task | None = None
             try:
                 # Ensure connection is alive
                 if not self.connection or self.connection.is_closed:
                     LOG.warning(
-                        f"Connection lost for queue {config.queue_name}, reconnecting..."
+                        "Connection lost for queue %s, reconnecting...", config.queue_name
                     )
                     await self.connect()
 
                 # Create a new channel for this consumer
-                consumer_channel = await self.connection.channel()
-                await consumer_channel.set_qos(prefetch_count=config.prefetch_count)
-                queue = await self._setup_consumer_on_channel(config, consumer_channel)
+                consumer_channel, queue = await self._open_consumer_channel(config)
 
                 # Reset reconnect counter on successful setup
                 attempt = 0
@@ -491,8 +695,19 @@ class AsyncSingleThreadMQConsumer:
                     hint = await self._special_queue(config)
                     return hint
 
+                ack_batcher = MessageAckBatcher(
+                    config.ack_batch_size, config.ack_interval_ms
+                )
+                ack_flush_task = asyncio.create_task(ack_batcher.run())
+                concurrency = asyncio.Semaphore(
+                    config.max_concurrency or config.prefetch_count
+                )
+
                 LOG.info(
-                    f"Looping consumer - queue: {config.queue_name} <- ({config.exchange_name}, {config.routing_key})"
+                    "Looping consumer - queue: %s <- (%s, %s)",
+                    config.queue_name,
+                    config.exchange_name,
+                    config.routing_key,
                 )
 
                 async with queue.iterator() as queue_iter:
@@ -501,7 +716,7 @@ class AsyncSingleThreadMQConsumer:
                             break
 
                         # Process message in background task for concurrency
-                        async def process_with_tracing():
+                        async def process_with_tracing(message: Message):
                             # Extract trace context from message headers if available
                             extracted_context = _extract_trace_context_from_headers(message)
                             
@@ -512,12 +727,19 @@ class AsyncSingleThreadMQConsumer:
                             
                             try:
                                 # Pass consume_context to process_message so it can create child spans
-                                return await self._process_message(config, message, consume_context)
+                                return await self._process_message(
+                                    config, message, ack_batcher, consume_context
+                                )
                             finally:
+                                concurrency.release()
                                 if consume_span:
                                     consume_span.end()
-                        
-                        task = asyncio.create_task(process_with_tracing())
+
+                        # Backpressure: stop pulling from the queue while the
+                        # consumer is at its concurrency cap
+                        await concurrency.acquire()
+                        ack_batcher.track(message)
+                        task = asyncio.create_task(process_with_tracing(message))
                         self._processing_tasks.add(task)
                         task.add_done_callback(self.cleanup_message_task)
 
@@ -526,36 +748,76 @@ class AsyncSingleThreadMQConsumer:
                     break
 
             except asyncio.CancelledError:
-                LOG.info(f"Consumer cancelled - queue: {config.queue_name}")
+                LOG.info("Consumer cancelled - queue: %s", config.queue_name)
                 raise  # Re-raise to allow proper cancellation
             except Exception as e:
                 attempt += 1
                 if attempt > max_reconnect_attempts:
                     LOG.error(
-                        f"Consumer failed after {max_reconnect_attempts} reconnection attempts - "
-                        f"queue: {config.queue_name}, error: {str(e)}"
+                        "Consumer failed after %d reconnection attempts - queue: %s, error: %s",
+                        max_reconnect_attempts,
+                        config.queue_name,
+                        e,
                     )
                     raise e
                 _delay_seconds = reconnect_delay * (attempt**2)
                 LOG.warning(
-                    f"Consumer error - queue: {config.queue_name}, error: {str(e)}, "
-                    f"attempt: {attempt}/{max_reconnect_attempts}, "
-                    f"reconnecting in {_delay_seconds}s..."
+                    "Consumer error - queue: %s, error: %s, attempt: %d/%d, "
+                    "reconnecting in %ss...",
+                    config.queue_name,
+                    e,
+                    attempt,
+                    max_reconnect_attempts,
+                    _delay_seconds,
                 )
                 await asyncio.sleep(_delay_seconds)
 
             finally:
+                if ack_flush_task is not None:
+                    ack_flush_task.cancel()
                 if consumer_channel and not consumer_channel.is_closed:
                     try:
+                        # Drain pending acks before the channel goes away
+                        if ack_batcher is not None:
+                            await ack_batcher.flush()
                         await consumer_channel.close()
-                        LOG.debug(
-                            f"Closed consumer channel - queue: {config.queue_name}"
-                        )
+                        LOG.debug("Closed consumer channel - queue: %s", config.queue_name)
                     except Exception as e:
                         LOG.warning(
-                            f"Error closing channel - queue: {config.queue_name}: {e}"
+                            "Error closing channel - queue: %s: %s", config.queue_name, e
                         )
-                LOG.info(f"Consumer channel closed - queue: {config.queue_name}")
+                LOG.info("Consumer channel closed - queue: %s", config.queue_name)
+
+    async def _open_consumer_channel(
+        self, config: ConsumerConfig
+    ) -> Tuple[AbstractChannel, AbstractQueue]:
+        """Open a consumer channel and make sure its topology exists"""
+        channel = await self.connection.channel()
+        topology = (config.exchange_name, config.queue_name)
+        try:
+            await channel.set_qos(prefetch_count=config.prefetch_count)
+            if topology not in self._declared_topologies:
+                queue = await self._setup_consumer_on_channel(config, channel)
+                if config.durable and not config.auto_delete:
+                    self._declared_topologies.add(topology)
+                return channel, queue
+            # Already declared once: a passive check is enough on reconnects
+            return channel, await channel.get_queue(config.queue_name, ensure=True)
+        except ChannelNotFoundEntity:
+            if topology not in self._declared_topologies:
+                raise
+            # e.g. broker lost its state; the failed check closed the channel
+            LOG.warning(
+                f"Queue {config.queue_name} not found on broker, redeclaring topology"
+            )
+            self._declared_topologies.discard(topology)
+            if not channel.is_closed:
+                await channel.close()
+            return await self._open_consumer_channel(config)
+        except BaseException:
+            if not channel.is_closed:
+                await channel.close()
+            raise
 
     async def _setup_consumer_on_channel(
         self,
@@ -610,10 +872,102 @@ class AsyncSingleThreadMQConsumer:
 
         return queue
 
-    async def publish(self, exchange_name: str, routing_key: str, body: str) -> None:
-        """Publish a message to an exchange without declaring it"""
+    def _ensure_publish_flusher(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if (
+            self._publish_flush_task is None
+            or self._publish_flush_task.done()
+            or self._publish_flush_task.get_loop() is not loop
+        ):
+            self._publish_queue = asyncio.Queue(maxsize=self.publish_queue_max)
+            self._publish_flush_task = asyncio.create_task(
+                self._publish_flusher(self._publish_queue)
+            )
+        return self._publish_queue
+
+    async def _publish_flusher(self, queue: asyncio.Queue) -> None:
+        """Drain everything queued within one loop tick and publish it concurrently"""
+        batch: List[Tuple[str, str, str | bytes | dict, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                # let producers scheduled in the same tick enqueue as well
+                await asyncio.sleep(0)
+                while len(batch) < self.publish_batch_max and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                results = await asyncio.gather(
+                    *(
+                        self.publish_sync(exchange_name, routing_key, body)
+                        for exchange_name, routing_key, body, _ in batch
+                    ),
+                    return_exceptions=True,
+                )
+                for (*_, fut), r in zip(batch, results):
+                    if fut.done():
+                        continue
+                    if isinstance(r, BaseException):
+                        fut.set_exception(r)
+                    else:
+                        fut.set_result(None)
+                batch = []
+        except asyncio.CancelledError:
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for *_, fut in batch:
+                if not fut.done():
+                    fut.set_exception(RuntimeError("MQ publisher stopped"))
+            raise
+
+    async def publish(
+        self, exchange_name: str, routing_key: str, body: str | bytes | dict
+    ) -> None:
+        """
+        Publish a message to an exchange without declaring it.
+
+        Publishes issued in the same loop tick are coalesced and sent together;
+        the call returns (or raises) once this message has been published.
+        """
         assert len(exchange_name) and len(routing_key)
-        
+        queue = self._ensure_publish_flusher()
+        fut = asyncio.get_running_loop().create_future()
+        # a full queue means the broker is falling behind, wait for room
+        await queue.put((exchange_name, routing_key, body, fut))
+        await fut
+
+    def publish_nowait(
+        self, exchange_name: str, routing_key: str, body: str | bytes | dict
+    ) -> bool:
+        """
+        Queue a message for the coalescing publisher without waiting for it.
+
+        Failures are logged rather than raised. Returns False, dropping the
+        message, when the publish queue is full.
+        """
+        assert len(exchange_name) and len(routing_key)
+        queue = self._ensure_publish_flusher()
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            queue.put_nowait((exchange_name, routing_key, body, fut))
+        except asyncio.QueueFull:
+            LOG.error(
+                "MQ publish queue is full, dropped message to exchange: %s, routing_key: %s",
+                exchange_name,
+                routing_key,
+            )
+            return False
+        fut.add_done_callback(
+            functools.partial(_log_publish_failure, exchange_name, routing_key)
+        )
+        return True
+
+    async def publish_sync(
+        self, exchange_name: str, routing_key: str, body: str | bytes | dict
+    ) -> None:
+        """Publish a message right away, bypassing the coalescing queue"""
+        assert len(exchange_name) and len(routing_key)
+        body = _encode_body(body)
+
         # Create span for message publishing and inject trace context into headers
         span, headers = _create_publish_span_and_headers(exchange_name, routing_key, body)
         
@@ -624,21 +978,30 @@ class AsyncSingleThreadMQConsumer:
                 raise RuntimeError("No active MQ Publish Channel")
 
             if self._publish_channle.is_closed:
-                self._publish_channle = await self.connection.channel()
+                self._publish_channle = await self.connection.channel(
+                    publisher_confirms=True
+                )
+                self._exchange_cache.clear()
             
             # Create the message with trace context in headers
             message = Message(
-                body.encode("utf-8"),
+                body,
                 content_type="application/json",
                 delivery_mode=2,  # Make message persistent
                 headers=headers if headers else None,
             )
 
-            exchange = await self._publish_channle.get_exchange(exchange_name)
+            exchange = self._exchange_cache.get(exchange_name)
+            if exchange is None:
+                # get_exchange() is a passive declare, i.e. one broker round-trip
+                exchange = await self._publish_channle.get_exchange(exchange_name)
+                self._exchange_cache[exchange_name] = exchange
             await exchange.publish(message, routing_key=routing_key)
 
             LOG.debug(
-                f"Published message to exchange: {exchange_name}, routing_key: {routing_key}"
+                "Published message to exchange: %s, routing_key: %s",
+                exchange_name,
+                routing_key,
             )
             
             if span:
@@ -673,18 +1036,20 @@ class AsyncSingleThreadMQConsumer:
             self._consumer_loop_tasks.append(task)
 
         LOG.info(f"Started all consumers (count: {len(self.consumers)})")
+        shutdown_task = asyncio.create_task(self._shutdown_event.wait())
+        waiting = {*self._consumer_loop_tasks, shutdown_task}
         try:
             # Wait for shutdown signal or any task to complete
             while not self._shutdown_event.is_set():
                 # special handlers maybe return earlier
-                done, pending = await asyncio.wait(
-                    self._consumer_loop_tasks
-                    + [asyncio.create_task(self._shutdown_event.wait())],
-                    return_when=asyncio.FIRST_COMPLETED,
+                done, waiting = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
                 )
 
                 # If shutdown event was triggered, tasks will be cancelled in stop()
                 for task in done:
+                    if task is shutdown_task:
+                        continue
                     try:
                         r = (
                             task.result()
@@ -701,6 +1066,7 @@ class AsyncSingleThreadMQConsumer:
                         return
             LOG.info("Shutdown event received")
         finally:
+            shutdown_task.cancel()
             await self.stop()
 
     async def stop(self) -> None:
@@ -729,6 +1095,9 @@ class AsyncSingleThreadMQConsumer:
             self._processing_tasks.clear()
 
         self._consumer_loop_tasks.clear()
+        if self._validator_pool is not None:
+            self._validator_pool.shutdown(wait=False, cancel_futures=True)
+            self._validator_pool = None
         await self.disconnect()
         LOG.info("All consumers stopped")
 
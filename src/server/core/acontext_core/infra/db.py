@@ -1,5 +1,6 @@
 import traceback
 import os
+import orjson
 from typing import Optional
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -21,6 +22,11 @@ from ..env import LOG as logger
 from ..env import DEFAULT_CORE_CONFIG
 
 
+def _json_dumps(value) -> str:
+    # JSON/JSONB binds expect a str; non-str keys are stringified like json.dumps does
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class DatabaseClient:
     """
     Best-practice SQLAlchemy database client with connection pooling.
@@ -49,32 +55,45 @@ class DatabaseClient:
             )
 
         logger.info(f"SQLAlchemy Engine URL: {self.database_url}")
-        self._engine: AsyncEngine | None = self._create_engine()
+        # Engine and sessionmakers are built on first use, not at import time
+        self._engine: AsyncEngine | None = None
         self._table_created: bool = False
-        self._sessionmaker: async_sessionmaker[AsyncSession] | None = (
-            async_sessionmaker(
-                bind=self.engine,
-                class_=AsyncSession,
-                expire_on_commit=False,
-                autoflush=True,
-                autocommit=False,
-            )
-        )
+        self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
+        self._readonly_sessionmaker: async_sessionmaker[AsyncSession] | None = None
 
     @property
     def engine(self) -> AsyncEngine:
         """Get the database engine, creating it if necessary."""
         if self._engine is None:
-            raise ValueError("Engine not initialized")
+            self._engine = self._create_engine()
         return self._engine
 
     @property
     def sessionmaker(self) -> async_sessionmaker[AsyncSession]:
         """Get the session maker, creating it if necessary."""
         if self._sessionmaker is None:
-            raise ValueError("Sessionmaker not initialized")
+            self._sessionmaker = async_sessionmaker(
+                bind=self.engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=True,
+                autocommit=False,
+            )
         return self._sessionmaker
 
+    @property
+    def readonly_sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        """Get the SELECT-only session maker (no autoflush), creating it if necessary."""
+        if self._readonly_sessionmaker is None:
+            self._readonly_sessionmaker = async_sessionmaker(
+                bind=self.engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+                autocommit=False,
+            )
+        return self._readonly_sessionmaker
+
     def _create_engine(self) -> AsyncEngine:
         """Create the SQLAlchemy async engine with optimal settings."""
         engine = create_async_engine(
@@ -82,7 +101,7 @@ class DatabaseClient:
             # Connection pool settings
             poolclass=AsyncAdaptedQueuePool,
             pool_size=DEFAULT_CORE_CONFIG.database_pool_size,  # Number of connections to maintain
-            max_overflow=DEFAULT_CORE_CONFIG.database_pool_size,  # Additional connections beyond pool_size
+            max_overflow=DEFAULT_CORE_CONFIG.database_pool_max_overflow,  # Additional connections beyond pool_size
             pool_timeout=30,  # Seconds to wait for a connection
             pool_recycle=600,  # Recycle connections after 10 minutes
             pool_pre_ping=True,  # Verify connections before use
@@ -90,14 +109,22 @@ class DatabaseClient:
             echo=False,  # Set to True for SQL debugging
             echo_pool=False,  # Set to True for pool debugging
             future=True,  # Use SQLAlchemy 2.0 behavior
+            # JSONB columns (parts_asset_meta, task data, ...) go through orjson
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
             # Connection arguments for asyncpg
             connect_args={
                 "server_settings": {
                     "application_name": "acontext_server",
-                    "jit": "off",  # Disable JIT for better performance in some cases
+                    # JIT stays on; short OLTP queries are kept below the JIT
+                    # threshold by jit_above_cost (migrations/002_jit_above_cost.sql).
+                    # Databases without 002 use Postgres's default threshold
                 },
                 "command_timeout": 60,  # Query timeout in seconds
-                "prepared_statement_cache_size": 0,  # Disable prepared statements cache
+                # SQLAlchemy-side cache of asyncpg prepared statements
+                "prepared_statement_cache_size": DEFAULT_CORE_CONFIG.database_prepared_statement_cache_size,
+                # asyncpg's own per-connection statement cache
+                "statement_cache_size": DEFAULT_CORE_CONFIG.database_statement_cache_size,
             },
         )
 
@@ -171,6 +198,23 @@ class DatabaseClient:
         finally:
             await session.close()
 
+    @asynccontextmanager
+    async def get_readonly_session_context(
+        self,
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get a database session for SELECT-only work.
+
+        The session never autoflushes and is not committed on exit; closing it
+        just hands the connection back to the pool. Use get_session_context()
+        for anything that writes.
+        """
+        session = self.readonly_sessionmaker()
+        try:
+            yield session
+        finally:
+            await session.close()
+
     async def health_check(self) -> bool:
         """
         Perform a health check on the database connection.
@@ -211,6 +255,7 @@ class DatabaseClient:
             await self._engine.dispose()
             self._engine = None
             self._sessionmaker = None
+            self._readonly_sessionmaker = None
             logger.info("Database connections closed")
 
     def get_pool_status(self) -> dict[str, int | str]:
@@ -226,7 +271,7 @@ class DatabaseClient:
         }
 
 
-# Lazy Loading Global database client instance
+# Lazy Loading Global database client instance: the engine is created on first use
 DB_CLIENT = DatabaseClient()
 
 
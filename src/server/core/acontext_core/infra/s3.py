@@ -98,6 +98,7 @@ class S3Client:
         self._session: aiobotocore.session.AioSession = get_aiobotocore_session()
         self._client: AioBaseClient = None
         self._client_lock: asyncio.Lock = None
+        self._download_slots: asyncio.Semaphore = None
 
     @property
     def client_lock(self):
@@ -106,6 +107,18 @@ class S3Client:
             self._client_lock = asyncio.Lock()
         return self._client_lock
 
+    @property
+    def download_slots(self):
+        """
+        Lazy-load the download semaphore, one slot per pooled connection.
+
+        Large fan-outs queue here instead of in the connection pool, where the wait
+        would count against connect_timeout.
+        """
+        if self._download_slots is None:
+            self._download_slots = asyncio.Semaphore(self.max_pool_connections)
+        return self._download_slots
+
     def _create_session(self) -> aiobotocore.session.AioSession:
         """Create aiobotocore session with optimal settings."""
         session = aiobotocore.session.AioSession()
@@ -215,7 +228,7 @@ class S3Client:
         bucket_name = bucket or self.bucket
 
         try:
-            async with self.get_client() as client:
+            async with self.download_slots, self.get_client() as client:
                 response = await client.get_object(Bucket=bucket_name, Key=key)
                 content = await response["Body"].read()
                 logger.debug(
@@ -228,6 +241,51 @@ class S3Client:
         except Exception as e:
             _handle_unexpected_error(e, bucket_name, key)
 
+    async def download_object_bytearray(
+        self, key: str, bucket: Optional[str] = None
+    ) -> bytearray:
+        """
+        Download S3 object content into a bytearray preallocated from ContentLength.
+
+        Chunks are copied straight into the buffer as they arrive, so a large object is
+        held once instead of as a chunk list plus the joined bytes.
+
+        Args:
+            key: The S3 object key
+            bucket: Optional bucket name (uses default if not specified)
+
+        Returns:
+            bytearray: The object content
+
+        Raises:
+            ClientError: If the object doesn't exist or other S3 errors
+            NoCredentialsError: If credentials are not configured
+        """
+        bucket_name = bucket or self.bucket
+
+        try:
+            async with self.download_slots, self.get_client() as client:
+                response = await client.get_object(Bucket=bucket_name, Key=key)
+                content = bytearray(response["ContentLength"])
+                offset = 0
+                with memoryview(content) as view:
+                    async for chunk in response["Body"].iter_chunks():
+                        view[offset : offset + len(chunk)] = chunk
+                        offset += len(chunk)
+                if offset != len(content):
+                    raise IOError(
+                        f"Expected {len(content)} bytes, got {offset} bytes"
+                    )
+                logger.debug(
+                    f"Downloaded object - bucket: {bucket_name}, key: {key}, size: {offset} bytes"
+                )
+                return content
+
+        except ClientError as e:
+            _handle_s3_client_error(e, bucket_name, key)
+        except Exception as e:
+            _handle_unexpected_error(e, bucket_name, key)
+
     async def upload_object(
         self,
         key: str,
@@ -68,7 +68,7 @@ async def space_construct_agent_curd(
         Result[Dict[str, Any]]: Processing result
     """
 
-    json_tools = [tool.model_dump() for tool in SpaceConstructPrompt.tool_schema()]
+    json_tools = SpaceConstructPrompt.json_tools()
     already_iterations = 0
     candidate_data_list = [
         {
@@ -98,11 +98,11 @@ async def space_construct_agent_curd(
         llm_return, eil = r.unpack()
         if eil:
             return r
-        _messages.append(response_to_sendable_message(llm_return))
         LOG.info(f"LLM Response: {llm_return.content}...")
         if not llm_return.tool_calls:
             LOG.info("No tool calls found, stop iterations")
             break
+        _messages.append(response_to_sendable_message(llm_return))
         use_tools = llm_return.tool_calls
         tool_response = []
         for tool_call in use_tools:
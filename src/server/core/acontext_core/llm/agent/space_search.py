@@ -35,7 +35,7 @@ async def space_agent_search(
     max_iterations: int = 16,
 ) -> Result[SpaceSearchCtx]:
 
-    json_tools = [tool.model_dump() for tool in SpaceSearchPrompt.tool_schema()]
+    json_tools = SpaceSearchPrompt.json_tools()
     already_iterations = 0
     _messages = [
         {
@@ -55,11 +55,11 @@ async def space_agent_search(
         llm_return, eil = r.unpack()
         if eil:
             return r
-        _messages.append(response_to_sendable_message(llm_return))
         LOG.info(f"LLM Response: {llm_return.content}...")
         if not llm_return.tool_calls:
             LOG.info("No tool calls found, stop iterations")
             break
+        _messages.append(response_to_sendable_message(llm_return))
         use_tools = llm_return.tool_calls
         tool_response = []
         for tool_call in use_tools:
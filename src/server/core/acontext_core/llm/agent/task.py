@@ -1,5 +1,8 @@
+import asyncio
+import logging
+from dataclasses import replace
 from typing import List
-from ...env import LOG, bound_logging_vars
+from ...env import LOG, DEFAULT_CORE_CONFIG, bound_logging_vars
 from ...infra.db import AsyncSession, DB_CLIENT
 from ...schema.result import Result
 from ...schema.utils import asUUID
@@ -13,12 +16,25 @@ from ..tool.task_lib.ctx import TaskCtx
 from ..tool.task_lib.insert import _insert_task_tool
 from ..tool.task_lib.update import _update_task_tool
 from ..tool.task_lib.append import _append_messages_to_task_tool
+from ..tool.task_lib.append_planning import _append_messages_to_planning_section_tool
 
 NEED_UPDATE_CTX = {
     _insert_task_tool.schema.function.name,
     _update_task_tool.schema.function.name,
     _append_messages_to_task_tool.schema.function.name,
 }
+# Tools whose writes TaskCtx queues and flushes as one batch per run of calls
+BATCHED_TOOLS = {
+    _insert_task_tool.schema.function.name,
+    _append_messages_to_task_tool.schema.function.name,
+}
+# Tools that write to the DB run one by one in the order the LLM emitted them;
+# the rest of a turn's tool calls run concurrently
+SERIAL_TOOLS = NEED_UPDATE_CTX | {
+    _append_messages_to_planning_section_tool.schema.function.name,
+}
+# caps the tool handlers running at once across all agent runs
+_CONCURRENT_TOOLS_SEM = asyncio.Semaphore(DEFAULT_CORE_CONFIG.agent_max_concurrent_tools)
 
 
 def pack_task_section(tasks: List[TaskSchema]) -> str:
@@ -45,30 +61,34 @@ def pack_previous_progress_section(
     return "\n".join(progresses[::-1])
 
 
+def _task_desc(
+    task_id: asUUID | None,
+    mappings: dict[asUUID, TaskSchema],
+    planning_task: TaskSchema | None,
+) -> str:
+    if task_id is None:
+        return "(no task linked)"
+    task = mappings.get(task_id)
+    if task is not None:
+        return f"(append to task_{task.order})"
+    if planning_task is not None and task_id == planning_task.id:
+        return "(append to planning_section)"
+    LOG.warning(f"Unknown task id: {task_id}")
+    return "(no task linked)"
+
+
 def pack_previous_messages_section(
     planning_task: TaskSchema | None,
     tasks: list[TaskSchema],
     messages: list[MessageBlob],
 ) -> str:
-    task_ids = [m.task_id for m in messages]
     mappings = {t.id: t for t in tasks}
     tool_mappings = {}
-    task_descs = []
-    for ti in task_ids:
-        if ti is None:
-            task_descs.append("(no task linked)")
-            continue
-        elif ti in mappings:
-            task_descs.append(f"(append to task_{mappings[ti].order})")
-        elif planning_task is not None and ti == planning_task.id:
-            task_descs.append("(append to planning_section)")
-        else:
-            LOG.warning(f"Unknown task id: {ti}")
-            task_descs.append("(no task linked)")
     return "\n---\n".join(
         [
-            f"{td}\n{m.to_string(tool_mappings, truncate_chars=256)}"
-            for td, m in zip(task_descs, messages)
+            f"{_task_desc(m.task_id, mappings, planning_task)}\n"
+            f"{m.to_string(tool_mappings, truncate_chars=256)}"
+            for m in messages
         ]
     )
 
@@ -88,19 +108,18 @@ async def build_task_ctx(
     project_id: asUUID,
     session_id: asUUID,
     messages: list[MessageBlob],
-    before_use_ctx: TaskCtx = None,
+    current_tasks: list[TaskSchema] | None = None,
 ) -> TaskCtx:
-    if before_use_ctx is not None:
-        before_use_ctx.db_session = db_session
-        return before_use_ctx
-
-    r = await TD.fetch_current_tasks(db_session, session_id)
-    current_tasks, eil = r.unpack()
-    if eil:
-        return r
-    LOG.debug(
-        f"Built task context {[(t.order, t.status.value, t.data.task_description) for t in current_tasks]}"
-    )
+    if current_tasks is None:
+        r = await TD.fetch_current_tasks(db_session, session_id)
+        current_tasks, eil = r.unpack()
+        if eil:
+            return r
+    if LOG.isEnabledFor(logging.DEBUG):
+        LOG.debug(
+            "Built task context %s",
+            [(t.order, t.status.value, t.data.task_description) for t in current_tasks],
+        )
     use_ctx = TaskCtx(
         db_session=db_session,
         project_id=project_id,
@@ -112,6 +131,193 @@ async def build_task_ctx(
     return use_ctx
 
 
+async def _run_tool(tool_call, ctx: TaskCtx) -> Result[dict]:
+    tool_name = tool_call.function.name
+    tool_arguments = tool_call.function.arguments
+    tool = TASK_TOOLS.get(tool_name)
+    if tool is None:
+        return Result.reject(f"Tool {tool_name} not found")
+    try:
+        with bound_logging_vars(tool=tool_name):
+            r = await tool.handler(ctx, tool_arguments)
+            t, eil = r.unpack()
+            if eil:
+                return r
+    except Exception as e:
+        return Result.reject(f"Tool {tool_name} error: {str(e)}")
+    if tool_name != "report_thinking":
+        LOG.info("Tool Call: %s - %s -> %s", tool_name, tool_arguments, t)
+    return Result.resolve(
+        {
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "content": t,
+        }
+    )
+
+
+class TurnToolRunner:
+    """
+    Runs one turn's tool calls as the LLM emits them. Tools outside
+    SERIAL_TOOLS start right away, on sessions of their own if they need one,
+    since an AsyncSession can't be shared by concurrent coroutines. SERIAL_TOOLS
+    write to the DB, so they are only queued while the response streams: they
+    run in order on one shared session once wait() is told the response
+    completed, and no row lock is held across the rest of the stream.
+    """
+
+    def __init__(
+        self,
+        project_id: asUUID,
+        session_id: asUUID,
+        messages: list[MessageBlob],
+        ctx: TaskCtx | None,
+    ):
+        self.project_id = project_id
+        self.session_id = session_id
+        self.messages = messages
+        self.ctx = ctx
+        self.just_finish = False
+        self._submitted = 0
+        self._serial_responses: dict[int, dict] = {}
+        self._serial_calls: list[tuple[int, object]] = []
+        self._concurrent_tasks: list[tuple[int, asyncio.Task]] = []
+
+    def submit(self, tool_call) -> None:
+        i = self._submitted
+        self._submitted += 1
+        tool_name = tool_call.function.name
+        if tool_name == "finish":
+            self.just_finish = True
+        elif tool_name in SERIAL_TOOLS:
+            if (early := self._pre_validate(tool_call)) is not None:
+                # answered without a DB session, nothing to queue
+                self._serial_responses[i] = early
+                return
+            self._serial_calls.append((i, tool_call))
+        else:
+            self._concurrent_tasks.append(
+                (i, asyncio.create_task(self._run_concurrent(tool_call)))
+            )
+
+    def _pre_validate(self, tool_call) -> dict | None:
+        tool = TASK_TOOLS.get(tool_call.function.name)
+        if tool is None or tool.pre_validate is None or self.ctx is None:
+            return None
+        try:
+            r = tool.pre_validate(self.ctx, tool_call.function.arguments)
+        except Exception:
+            # let the handler report malformed arguments
+            return None
+        if r is None:
+            return None
+        LOG.info(
+            "Tool Call: %s - %s -> %s",
+            tool_call.function.name,
+            tool_call.function.arguments,
+            r.data,
+        )
+        return {"role": "tool", "tool_call_id": tool_call.id, "content": r.data}
+
+    async def _run_concurrent(self, tool_call) -> Result[dict]:
+        tool = TASK_TOOLS.get(tool_call.function.name)
+        if tool is None or not tool.needs_db_session:
+            # nothing to read or write, the ctx goes through as it is
+            async with _CONCURRENT_TOOLS_SEM:
+                return await _run_tool(tool_call, self.ctx)
+        async with DB_CLIENT.get_session_context() as db_session:
+            ctx = self.ctx
+            if ctx is None:
+                ctx = await build_task_ctx(
+                    db_session, self.project_id, self.session_id, self.messages
+                )
+            async with _CONCURRENT_TOOLS_SEM:
+                return await _run_tool(tool_call, replace(ctx, db_session=db_session))
+
+    async def _in_savepoint(self, db_session: AsyncSession, run) -> Result:
+        # a failed tool undoes only its own writes, the earlier ones stay
+        savepoint = await db_session.begin_nested()
+        try:
+            r = await run()
+        except BaseException:
+            await savepoint.rollback()
+            raise
+        if r.ok():
+            await savepoint.commit()
+        else:
+            await savepoint.rollback()
+        return r
+
+    async def _run_serial(self) -> Result[None]:
+        stale_ctx = False
+        last_tool_name = None
+        r = Result.resolve(None)
+        async with DB_CLIENT.get_session_context() as db_session:
+            for i, tool_call in self._serial_calls:
+                tool_name = tool_call.function.name
+                # a run of the same batched tool keeps queueing on one ctx
+                same_batch = tool_name in BATCHED_TOOLS and tool_name == last_tool_name
+                last_tool_name = tool_name
+                if self.ctx is not None:
+                    self.ctx.db_session = db_session
+                    if not same_batch:
+                        # write what the previous run queued before anything reads it
+                        r = await self._in_savepoint(db_session, self.ctx.flush)
+                        if not r.ok():
+                            break
+                if self.ctx is None or (stale_ctx and not same_batch):
+                    self.ctx = await build_task_ctx(
+                        db_session, self.project_id, self.session_id, self.messages
+                    )
+                    stale_ctx = False
+                r = await self._in_savepoint(
+                    db_session, lambda: _run_tool(tool_call, self.ctx)
+                )
+                t, eil = r.unpack()
+                if eil:
+                    break
+                # let the next ctx refresh re-read what this tool changed
+                db_session.expire_all()
+                self._serial_responses[i] = t
+                if tool_name in NEED_UPDATE_CTX:
+                    stale_ctx = True
+            if self.ctx is not None:
+                # one batch for the trailing run
+                fr = await self._in_savepoint(db_session, self.ctx.flush)
+                if not fr.ok():
+                    r = fr
+        if stale_ctx:
+            self.ctx = None
+        return r
+
+    async def wait(self, llm_result: Result) -> Result[list[dict]]:
+        """
+        Wait for every submitted tool; the tool messages come back in call order.
+        The serial tools only run if llm_result is ok; a response that broke off
+        writes nothing.
+        """
+        serial = []
+        if self._serial_calls and llm_result.ok():
+            serial = [asyncio.create_task(self._run_serial())]
+        concurrent = [task for _, task in self._concurrent_tasks]
+        results = await asyncio.gather(*concurrent, *serial, return_exceptions=True)
+        responses = dict(self._serial_responses)
+        for (i, _), r in zip(self._concurrent_tasks, results):
+            if isinstance(r, BaseException):
+                return Result.reject(f"Tool error: {str(r)}")
+            t, eil = r.unpack()
+            if eil:
+                return r
+            responses[i] = t
+        if serial:
+            r = results[-1]
+            if isinstance(r, BaseException):
+                return Result.reject(f"Tool error: {str(r)}")
+            if not r.ok():
+                return r
+        return Result.resolve([responses[i] for i in sorted(responses)])
+
+
 @track_process
 async def task_agent_curd(
     project_id: asUUID,
@@ -125,6 +331,10 @@ async def task_agent_curd(
         tasks, eil = r.unpack()
         if eil:
             return r
+        # tasks were just fetched, so the first tool calls can reuse them
+        USE_CTX = await build_task_ctx(
+            db_session, project_id, session_id, messages, current_tasks=tasks
+        )
 
     task_section = pack_task_section(tasks)
     previous_progress_section = pack_previous_progress_section(
@@ -132,10 +342,9 @@ async def task_agent_curd(
     )
     current_messages_section = pack_current_message_with_ids(messages)
 
-    LOG.info(f"Task Section: {task_section}")
-    LOG.info(f"Previous Progress Section: {previous_progress_section}")
+    LOG.debug("Task Section: %s", task_section)
+    LOG.debug("Previous Progress Section: %s", previous_progress_section)
 
-    json_tools = [tool.model_dump() for tool in TaskPrompt.tool_schema()]
     already_iterations = 0
     _messages = [
         {
@@ -146,63 +355,33 @@ async def task_agent_curd(
         }
     ]
     while already_iterations < max_iterations:
+        runner = TurnToolRunner(project_id, session_id, messages, USE_CTX)
         r = await llm_complete(
             system_prompt=TaskPrompt.system_prompt(),
             history_messages=_messages,
-            tools=json_tools,
+            tools=TaskPrompt.json_tools(),
             prompt_kwargs=TaskPrompt.prompt_kwargs(),
+            on_tool_call=runner.submit,
         )
+        # tools may already be running on a partial stream, let them settle;
+        # the DB writing ones only run if the stream completed
+        tr = await runner.wait(r)
+        USE_CTX = runner.ctx
         llm_return, eil = r.unpack()
         if eil:
             return r
-        _messages.append(response_to_sendable_message(llm_return))
-        LOG.info(f"LLM Response: {llm_return.content}...")
+        LOG.info("LLM Response: %.200s...", llm_return.content or "")
         if not llm_return.tool_calls:
             LOG.info("No tool calls found, stop iterations")
             break
-        use_tools = llm_return.tool_calls
-        just_finish = False
-        tool_response = []
-        USE_CTX = None
-        for tool_call in use_tools:
-            try:
-                tool_name = tool_call.function.name
-                if tool_name == "finish":
-                    just_finish = True
-                    continue
-                tool_arguments = tool_call.function.arguments
-                tool = TASK_TOOLS[tool_name]
-                with bound_logging_vars(tool=tool_name):
-                    async with DB_CLIENT.get_session_context() as db_session:
-                        USE_CTX = await build_task_ctx(
-                            db_session,
-                            project_id,
-                            session_id,
-                            messages,
-                            before_use_ctx=USE_CTX,
-                        )
-                        r = await tool.handler(USE_CTX, tool_arguments)
-                    t, eil = r.unpack()
-                    if eil:
-                        return r
-                if tool_name != "report_thinking":
-                    LOG.info(f"Tool Call: {tool_name} - {tool_arguments} -> {t}")
-                tool_response.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": t,
-                    }
-                )
-                if tool_name in NEED_UPDATE_CTX:
-                    USE_CTX = None
-            except KeyError as e:
-                return Result.reject(f"Tool {tool_name} not found: {str(e)}")
-            except Exception as e:
-                return Result.reject(f"Tool {tool_name} error: {str(e)}")
-        _messages.extend(tool_response)
-        if just_finish:
+        tool_response, eil = tr.unpack()
+        if eil:
+            return tr
+        if runner.just_finish:
+            # the conversation ends here, no need to carry this turn over
             LOG.info("finish function is called")
             break
+        _messages.append(response_to_sendable_message(llm_return))
+        _messages.extend(tool_response)
         already_iterations += 1
     return Result.resolve(None)
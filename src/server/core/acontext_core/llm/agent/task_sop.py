@@ -73,7 +73,7 @@ async def sop_agent_curd(
             custom_scoring_rules=project_config.sop_agent_custom_scoring_rules
         )
 
-    json_tools = [tool.model_dump() for tool in TaskSOPPrompt.tool_schema()]
+    json_tools = TaskSOPPrompt.json_tools()
     already_iterations = 0
     already_submit = False
     _messages = [
@@ -94,11 +94,11 @@ async def sop_agent_curd(
         llm_return, eil = r.unpack()
         if eil:
             return r
-        _messages.append(response_to_sendable_message(llm_return))
         LOG.info(f"LLM Response: {llm_return.content}...")
         if not llm_return.tool_calls:
             LOG.info("No tool calls found, stop iterations")
             break
+        _messages.append(response_to_sendable_message(llm_return))
         use_tools = llm_return.tool_calls
         tool_response = []
         USE_CTX = SOPCtx(
@@ -1,6 +1,7 @@
 from typing import Callable, Awaitable, Mapping, Optional
-from .openai_sdk import openai_complete
+from .openai_sdk import openai_complete, ToolCallCallback
 from .anthropic_sdk import anthropic_complete
+from .cache import LLMResponseCache
 from ...schema.llm import LLMResponse
 from ...schema.result import Result
 from ...env import LOG, DEFAULT_CORE_CONFIG, bound_logging_vars
@@ -14,6 +15,19 @@ FACTORIES: Mapping[str, COMPLETE_FUNC] = {
     "anthropic": anthropic_complete,
 }
 
+RESPONSE_CACHE = LLMResponseCache(
+    maxsize=DEFAULT_CORE_CONFIG.llm_response_cache_size,
+    ttl_seconds=DEFAULT_CORE_CONFIG.llm_response_cache_ttl_seconds,
+)
+
+
+def _request_temperature(kwargs: dict):
+    if "temperature" in kwargs:
+        return kwargs["temperature"]
+    if DEFAULT_CORE_CONFIG.llm_sdk == "openai":
+        return DEFAULT_CORE_CONFIG.llm_openai_completion_kwargs.get("temperature")
+    return None
+
 
 @instrument_llm_complete
 async def llm_complete(
@@ -25,11 +39,48 @@ async def llm_complete(
     max_tokens=1024,
     prompt_kwargs: Optional[dict] = None,
     tools=None,
+    on_tool_call: Optional[ToolCallCallback] = None,
     **kwargs,
 ) -> Result[LLMResponse]:
+    """
+    on_tool_call receives every tool call of the response exactly once, in order.
+    With the openai SDK and llm_stream_tool_calls on, that happens while the
+    response is still streaming; otherwise it happens once the response is complete.
+    """
     use_model = model or DEFAULT_CORE_CONFIG.llm_simple_model
     use_complete_func = FACTORIES[DEFAULT_CORE_CONFIG.llm_sdk]
 
+    # Only deterministic requests are cached; the provider default temperature isn't 0
+    cache_key = None
+    if _request_temperature(kwargs) == 0:
+        cache_key = RESPONSE_CACHE.make_key(
+            sdk=DEFAULT_CORE_CONFIG.llm_sdk,
+            model=use_model,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            history_messages=history_messages,
+            json_mode=json_mode,
+            max_tokens=max_tokens,
+            tools=tools,
+            kwargs=kwargs,
+        )
+    if cache_key is not None:
+        cached = RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            LOG.debug("LLM Complete: cache hit for %s", use_model)
+            if on_tool_call is not None:
+                for tool_call in cached.tool_calls or []:
+                    on_tool_call(tool_call)
+            return Result.resolve(cached)
+
+    streams_tool_calls = (
+        on_tool_call is not None
+        and DEFAULT_CORE_CONFIG.llm_sdk == "openai"
+        and DEFAULT_CORE_CONFIG.llm_stream_tool_calls
+    )
+    if streams_tool_calls:
+        kwargs["on_tool_call"] = on_tool_call
+
     try:
         response = await use_complete_func(
             prompt,
@@ -45,6 +96,11 @@ async def llm_complete(
     except Exception as e:
         return Result.reject(f"LLM complete failed - error: {str(e)}")
 
+    if on_tool_call is not None and not streams_tool_calls:
+        for tool_call in response.tool_calls or []:
+            on_tool_call(tool_call)
+    if cache_key is not None and not (json_mode and response.json_content is None):
+        RESPONSE_CACHE.set(cache_key, response)
     return Result.resolve(response)
 
 
@@ -59,7 +115,9 @@ async def llm_sanity_check():
 
 def response_to_sendable_message(message: LLMResponse) -> dict:
     if DEFAULT_CORE_CONFIG.llm_sdk == "openai":
-        return message.raw_response.choices[0].message.model_dump()
+        # plain dict without the null-only fields (audio, refusal, ...), so it is
+        # serialized as-is on every later request of the conversation
+        return message.raw_response.choices[0].message.model_dump(exclude_none=True)
     elif DEFAULT_CORE_CONFIG.llm_sdk == "anthropic":
         dp = {"role": message.role, "content": []}
         if message.content:
@@ -1,5 +1,5 @@
 from hmac import new
-import json
+import orjson
 from typing import Optional
 from .clients import get_anthropic_async_client_instance
 from anthropic.types import Message, ContentBlock
@@ -52,6 +52,19 @@ def process_messages(messages: list[dict]) -> list[dict]:
     return new_messages
 
 
+def with_cache_breakpoint(message: dict) -> dict:
+    """Copy of the message with a cache_control breakpoint on its last block"""
+    content = message["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    elif not content:
+        return message
+    else:
+        content = list(content)
+    content[-1] = {**content[-1], "cache_control": {"type": "ephemeral"}}
+    return {**message, "content": content}
+
+
 async def anthropic_complete(
     prompt=None,
     model=None,
@@ -96,6 +109,19 @@ async def anthropic_complete(
             f"{system_prompt}\nPlease respond with valid JSON only, don't wrap the json with ```json"
         )
 
+    # Cache the static prefix (tools + system) and the first message, which stays
+    # the same across the iterations of an agent loop
+    if DEFAULT_CORE_CONFIG.llm_prompt_caching:
+        if request_params["system"]:
+            request_params["system"] = [
+                {
+                    "type": "text",
+                    "text": request_params["system"],
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+        messages[0] = with_cache_breakpoint(messages[0])
+
     # Handle tools if provided (Anthropic has a different tool format)
     if tools:
         # Convert OpenAI-style tools to Anthropic format if needed
@@ -145,9 +171,9 @@ async def anthropic_complete(
         # Handle JSON mode parsing
         if json_mode and content:
             try:
-                json_content = json.loads(content)
+                json_content = orjson.loads(content)
                 llm_response.json_content = json_content
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 LOG.error(f"JSON decode error: {content}")
                 llm_response.json_content = None
 
@@ -0,0 +1,46 @@
+import hashlib
+import orjson
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Optional
+from ...schema.llm import LLMResponse
+
+
+class LLMResponseCache:
+    """In-process LRU of LLM responses for exact-match requests, with a TTL"""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, LLMResponse]] = OrderedDict()
+
+    @staticmethod
+    def make_key(**request: Any) -> Optional[str]:
+        """Hash a request; None if some part of it can't be serialized"""
+        try:
+            raw = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return None
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, response = item
+        if expires_at < monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: LLMResponse) -> None:
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (monotonic() + self.ttl_seconds, response)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
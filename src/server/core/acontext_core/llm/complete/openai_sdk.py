@@ -1,11 +1,17 @@
-import json
-from typing import Optional
+import hashlib
+import orjson
+from typing import Callable, Optional
 from .clients import get_openai_async_client_instance
+from openai import AsyncOpenAI
+from openai.lib.streaming.chat import ChatCompletionStreamState
 from openai.types.chat import ChatCompletion
 from openai.types.chat import ChatCompletionMessageToolCall
 from time import perf_counter
+from urllib.parse import urlparse
 from ...env import LOG, DEFAULT_CORE_CONFIG
-from ...schema.llm import LLMResponse
+from ...schema.llm import LLMResponse, LLMToolCall
+
+ToolCallCallback = Callable[[LLMToolCall], None]
 
 
 def convert_openai_tool_to_llm_tool(tool_body: ChatCompletionMessageToolCall) -> dict:
@@ -14,11 +20,70 @@ def convert_openai_tool_to_llm_tool(tool_body: ChatCompletionMessageToolCall) ->
         "type": tool_body.type,
         "function": {
             "name": tool_body.function.name,
-            "arguments": json.loads(tool_body.function.arguments),
+            "arguments": orjson.loads(tool_body.function.arguments),
         },
     }
 
 
+# id(tools) -> (tools, encoded tools); agents pass the same long-lived
+# BasePrompt.json_tools() list on every request, so it is encoded only once
+_TOOLS_JSON: dict[int, tuple[list, bytes]] = {}
+_TOOLS_JSON_MAX = 64
+
+
+def _tools_json(tools: Optional[list]) -> bytes:
+    hit = _TOOLS_JSON.get(id(tools))
+    if hit is not None and hit[0] is tools:
+        return hit[1]
+    encoded = orjson.dumps(tools, option=orjson.OPT_SORT_KEYS)
+    if tools is not None and len(_TOOLS_JSON) < _TOOLS_JSON_MAX:
+        # keep a reference so the id can't be reused by another list
+        _TOOLS_JSON[id(tools)] = (tools, encoded)
+    return encoded
+
+
+def prompt_cache_key(system_prompt: str, tools: Optional[list]) -> str:
+    """Route requests sharing a system prompt and tool set to the same prefix cache"""
+    prefix = system_prompt.encode() + _tools_json(tools)
+    return hashlib.sha256(prefix).hexdigest()[:32]
+
+
+def accepts_prompt_cache_key(base_url: Optional[str]) -> bool:
+    """Only the OpenAI API is known to take it, strict compatible servers 400 on unknown fields"""
+    return base_url is None or urlparse(base_url).hostname == "api.openai.com"
+
+
+async def stream_completion(
+    client: AsyncOpenAI,
+    on_tool_call: ToolCallCallback,
+    tools: list,
+    **create_kwargs,
+) -> ChatCompletion:
+    """
+    Stream a completion and hand each tool call to on_tool_call as soon as its
+    arguments are complete, while the rest of the response is still decoding.
+    """
+    create_kwargs.setdefault("stream_options", {"include_usage": True})
+    state = ChatCompletionStreamState(input_tools=tools)
+    stream = await client.chat.completions.create(
+        stream=True, tools=tools, **create_kwargs
+    )
+    async with stream:
+        async for chunk in stream:
+            for event in state.handle_chunk(chunk):
+                if event.type != "tool_calls.function.arguments.done":
+                    continue
+                tool_call = state.current_completion_snapshot.choices[
+                    0
+                ].message.tool_calls[event.index]
+                on_tool_call(
+                    LLMToolCall.model_validate(
+                        convert_openai_tool_to_llm_tool(tool_call)
+                    )
+                )
+    return state.get_final_completion()
+
+
 async def openai_complete(
     prompt=None,
     model=None,
@@ -28,6 +93,7 @@ async def openai_complete(
     max_tokens=1024,
     prompt_kwargs: Optional[dict] = None,
     tools=None,
+    on_tool_call: Optional[ToolCallCallback] = None,
     **kwargs,
 ) -> LLMResponse:
     prompt_kwargs = prompt_kwargs or {}
@@ -48,23 +114,48 @@ async def openai_complete(
     if not messages:
         raise ValueError("No messages provided")
 
+    completion_kwargs = {**DEFAULT_CORE_CONFIG.llm_openai_completion_kwargs, **kwargs}
+    if (
+        DEFAULT_CORE_CONFIG.llm_prompt_caching
+        and system_prompt
+        and accepts_prompt_cache_key(DEFAULT_CORE_CONFIG.llm_base_url)
+    ):
+        completion_kwargs["extra_body"] = {
+            "prompt_cache_key": prompt_cache_key(system_prompt, tools),
+            **completion_kwargs.get("extra_body", {}),
+        }
+
     _start_s = perf_counter()
-    response: ChatCompletion = await openai_async_client.chat.completions.create(
-        model=model,
-        messages=messages,
-        timeout=DEFAULT_CORE_CONFIG.llm_response_timeout,
-        max_tokens=max_tokens,
-        tools=tools,
-        **DEFAULT_CORE_CONFIG.llm_openai_completion_kwargs,
-        **kwargs,
-    )
+    if on_tool_call is not None and tools:
+        response = await stream_completion(
+            openai_async_client,
+            on_tool_call,
+            tools,
+            model=model,
+            messages=messages,
+            timeout=DEFAULT_CORE_CONFIG.llm_response_timeout,
+            max_tokens=max_tokens,
+            **completion_kwargs,
+        )
+    else:
+        response: ChatCompletion = await openai_async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            timeout=DEFAULT_CORE_CONFIG.llm_response_timeout,
+            max_tokens=max_tokens,
+            tools=tools,
+            **completion_kwargs,
+        )
     _end_s = perf_counter()
-    cached_tokens = getattr(response.usage.prompt_tokens_details, "cached_tokens", None)
-    LOG.info(
-        f"LLM Complete: {prompt_id} {model}. "
-        f"cached {cached_tokens}, input {response.usage.prompt_tokens}, total {response.usage.total_tokens}, "
-        f"time {_end_s - _start_s:.4f}s"
-    )
+    if response.usage is not None:
+        cached_tokens = getattr(
+            response.usage.prompt_tokens_details, "cached_tokens", None
+        )
+        LOG.info(
+            f"LLM Complete: {prompt_id} {model}. "
+            f"cached {cached_tokens}, input {response.usage.prompt_tokens}, total {response.usage.total_tokens}, "
+            f"time {_end_s - _start_s:.4f}s"
+        )
 
     # Only support tool calls
     _tu = (
@@ -85,8 +176,8 @@ async def openai_complete(
 
     if json_mode:
         try:
-            json_content = json.loads(response.choices[0].message.content)
-        except json.JSONDecodeError:
+            json_content = orjson.loads(response.choices[0].message.content)
+        except orjson.JSONDecodeError:
             LOG.error(f"JSON decode error: {response.choices[0].message.content}")
             json_content = None
         llm_response.json_content = json_content
@@ -1,3 +1,4 @@
+from functools import cache
 from ...schema.llm import ToolSchema
 
 
@@ -17,3 +18,9 @@ class BasePrompt:
     @classmethod
     def tool_schema(cls) -> list[ToolSchema]:
         pass
+
+    @classmethod
+    @cache
+    def json_tools(cls) -> list[dict]:
+        """tool_schema() dumped for the LLM request, computed once per prompt class"""
+        return [tool.model_dump() for tool in cls.tool_schema()]
@@ -8,6 +8,11 @@ from ...schema.result import Result
 class Tool:
     schema: ToolSchema = None
     handler: Callable[..., Awaitable[Result[str]]] = None
+    # optional check that needs no DB session; a returned Result is the
+    # tool's answer and the handler is skipped
+    pre_validate: Callable[..., Result[str] | None] = None
+    # tools outside the agent's serial set get a DB session only if they ask
+    needs_db_session: bool = False
 
     def use_schema(self, schema: ToolSchema) -> "Tool":
         self.schema = schema
@@ -17,5 +22,13 @@ class Tool:
         self.handler = handler
         return self
 
+    def use_pre_validate(self, pre_validate: Callable[..., Result[str] | None]) -> "Tool":
+        self.pre_validate = pre_validate
+        return self
+
+    def use_db_session(self) -> "Tool":
+        self.needs_db_session = True
+        return self
+
 
 ToolPool = dict[str, Tool]
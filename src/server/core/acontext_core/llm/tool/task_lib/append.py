@@ -1,64 +1,44 @@
 from ..base import Tool
 from ....schema.llm import ToolSchema
 from ....schema.result import Result
-from ....service.data import task as TD
 from ....schema.session.task import TaskStatus
 from .ctx import TaskCtx
+from .args import TaskOrderArg, MessageIdsArg, pre_validate_message_ids
+
+_TERMINAL_STATUSES = frozenset({TaskStatus.SUCCESS, TaskStatus.FAILED})
 
 
 async def _append_messages_to_task_handler(
     ctx: TaskCtx,
     llm_arguments: dict,
 ) -> Result[str]:
-    task_order: int = llm_arguments.get("task_order", None)
-    message_order_indexes = llm_arguments.get("message_ids", [])
     progress_note = llm_arguments.get("progress", None)
     user_preference = llm_arguments.get("user_preference_and_infos", "").strip()
 
-    if not task_order:
-        return Result.resolve(
-            "You must provide a task order argument, so that we can attach messages to the task. Appending failed."
-        )
-    if task_order > len(ctx.task_ids_index) or task_order < 1:
-        return Result.resolve(
-            f"Task order {task_order} is out of range, appending failed."
-        )
-    actually_task_id = ctx.task_ids_index[task_order - 1]
-    actually_task = ctx.task_index[task_order - 1]
-    actually_message_ids = [
-        ctx.message_ids_index[i]
-        for i in message_order_indexes
-        if i < len(ctx.message_ids_index)
-    ]
-    if not actually_message_ids:
+    task = TaskOrderArg.parse(ctx, llm_arguments, "appending")
+    if isinstance(task, Result):
+        return task
+    messages = MessageIdsArg.parse(ctx, llm_arguments)
+    if isinstance(messages, Result):
+        return messages
+    if task.task.status in _TERMINAL_STATUSES:
         return Result.resolve(
-            f"No message ids to append, skip: {message_order_indexes}"
+            f"Appending failed. Task {task.order} is already {task.task.status}. Update its status to 'running' first then append messages."
         )
-    if actually_task.status in (TaskStatus.SUCCESS, TaskStatus.FAILED):
-        return Result.resolve(
-            f"Appending failed. Task {task_order} is already {actually_task.status}. Update its status to 'running' first then append messages."
-        )
-    r = await TD.append_messages_to_task(
-        ctx.db_session,
-        actually_message_ids,
-        actually_task_id,
-    )
-    if not r.ok():
-        return r
+    # the links, progress and status are written in one batch when the tool
+    # loop flushes the ctx, so none of them lands without the others
+    ctx.queue_append(task.task_id, messages.message_ids)
     if progress_note is not None:
-        r = await TD.append_progress_to_task(
-            ctx.db_session, actually_task_id, progress_note, user_preference or None
-        )
-        if not r.ok():
-            return r
-    if actually_task.status != TaskStatus.RUNNING:
-        r = await TD.update_task(
-            ctx.db_session,
-            actually_task_id,
-            status="running",
+        ctx.pending_progresses.append(
+            (task.task_id, progress_note, user_preference or None)
         )
+    if (
+        task.task.status != TaskStatus.RUNNING
+        and task.task_id not in ctx.pending_running
+    ):
+        ctx.pending_running.append(task.task_id)
     return Result.resolve(
-        f"Messages {message_order_indexes} and progress are appended to task {task_order}"
+        f"Messages {messages.indexes} and progress are appended to task {task.order}"
     )
 
 
@@ -99,4 +79,5 @@ _append_messages_to_task_tool = (
         )
     )
     .use_handler(_append_messages_to_task_handler)
+    .use_pre_validate(pre_validate_message_ids)
 )
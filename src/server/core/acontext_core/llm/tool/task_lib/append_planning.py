@@ -3,30 +3,24 @@ from ....schema.llm import ToolSchema
 from ....schema.result import Result
 from ....service.data import task as TD
 from .ctx import TaskCtx
+from .args import MessageIdsArg, pre_validate_message_ids
 
 
 async def _append_messages_to_planning_section_handler(
     ctx: TaskCtx,
     llm_arguments: dict,
 ) -> Result[str]:
-    message_order_indexes = llm_arguments.get("message_ids", [])
-    actually_message_ids = [
-        ctx.message_ids_index[i]
-        for i in message_order_indexes
-        if i < len(ctx.message_ids_index)
-    ]
-    if not actually_message_ids:
-        return Result.resolve(
-            f"No message ids to append, skip: {message_order_indexes}"
-        )
+    messages = MessageIdsArg.parse(ctx, llm_arguments)
+    if isinstance(messages, Result):
+        return messages
     r = await TD.append_messages_to_planning_section(
         ctx.db_session,
         ctx.project_id,
         ctx.session_id,
-        actually_message_ids,
+        messages.message_ids,
     )
     return (
-        Result.resolve(f"Messages {message_order_indexes} appended to planning section")
+        Result.resolve(f"Messages {messages.indexes} appended to planning section")
         if r.ok()
         else r
     )
@@ -55,4 +49,5 @@ Use this when messages are about the agent/user is planning general plan, and th
         )
     )
     .use_handler(_append_messages_to_planning_section_handler)
+    .use_pre_validate(pre_validate_message_ids)
 )
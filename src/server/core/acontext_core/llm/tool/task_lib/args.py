@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from ....schema.result import Result
+from ....schema.utils import asUUID
+from ....schema.session.task import TaskSchema
+from .ctx import TaskCtx
+
+_NO_TASK_ORDER = {
+    "appending": Result.resolve(
+        "You must provide a task order argument, so that we can attach messages to the task. Appending failed."
+    ),
+    "updating": Result.resolve(
+        "You must provide a task order argument, so that we can update the task. Updating failed."
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def _out_of_range(task_order: int, action: str) -> Result[str]:
+    return Result.resolve(f"Task order {task_order} is out of range, {action} failed.")
+
+
+@dataclass(slots=True)
+class TaskOrderArg:
+    order: int
+    task_id: asUUID
+    task: TaskSchema
+
+    @classmethod
+    def parse(
+        cls, ctx: TaskCtx, llm_arguments: dict, action: str
+    ) -> "TaskOrderArg | Result[str]":
+        """Resolve `task_order` against the ctx, or the message telling the LLM why not"""
+        task_order = llm_arguments.get("task_order", None)
+        if not task_order:
+            return _NO_TASK_ORDER[action]
+        task_id = ctx.task_id_by_order.get(task_order)
+        if task_id is None:
+            return _out_of_range(task_order, action)
+        return cls(task_order, task_id, ctx.task_by_order[task_order])
+
+
+@dataclass(slots=True)
+class MessageIdsArg:
+    indexes: list[int]
+    message_ids: list[asUUID]
+
+    @classmethod
+    def parse(cls, ctx: TaskCtx, llm_arguments: dict) -> "MessageIdsArg | Result[str]":
+        """Resolve the `message_ids` indexes against the ctx, skipping unknown ones"""
+        indexes = llm_arguments.get("message_ids", [])
+        message_ids = [
+            mid for i in indexes if (mid := ctx.message_id_by_order.get(i)) is not None
+        ]
+        if not message_ids:
+            return Result.resolve(f"No message ids to append, skip: {indexes}")
+        return cls(indexes, message_ids)
+
+
+def pre_validate_message_ids(ctx: TaskCtx, llm_arguments: dict) -> Result[str] | None:
+    """Message indexes don't change within a turn, so they can be checked up front"""
+    messages = MessageIdsArg.parse(ctx, llm_arguments)
+    return messages if isinstance(messages, Result) else None
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from ....infra.db import AsyncSession
+from ....schema.result import Result
 from ....schema.utils import asUUID
 from ....schema.session.task import TaskSchema
+from ....service.data import task as TD
+from ....constants import MetricTags
+from ....telemetry.capture_metrics import capture_increment
 
 
 @dataclass
@@ -12,3 +17,72 @@ class TaskCtx:
     task_ids_index: list[asUUID]
     task_index: list[TaskSchema]
     message_ids_index: list[asUUID]
+    # task_id -> message ids linked by append_messages_to_task, written by flush()
+    pending_appends: dict[asUUID, list[asUUID]] = field(default_factory=dict)
+    # (after_order, data) queued by insert_task, written by flush()
+    pending_inserts: list[tuple[int, dict]] = field(default_factory=list)
+    # (task_id, progress, user_preference) and tasks to mark running, queued by
+    # append_messages_to_task so they are written together with its links
+    pending_progresses: list[tuple[asUUID, str, str | None]] = field(
+        default_factory=list
+    )
+    pending_running: list[asUUID] = field(default_factory=list)
+    # lookups by the 1-based task order and the message index the LLM sees
+    task_id_by_order: dict[int, asUUID] = field(init=False, repr=False)
+    task_by_order: dict[int, TaskSchema] = field(init=False, repr=False)
+    message_id_by_order: dict[int, asUUID] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.task_id_by_order = dict(enumerate(self.task_ids_index, start=1))
+        self.task_by_order = dict(enumerate(self.task_index, start=1))
+        self.message_id_by_order = dict(enumerate(self.message_ids_index))
+
+    def queue_append(self, task_id: asUUID, message_ids: list[asUUID]) -> None:
+        # a message re-appended in the same batch ends up on the last task
+        moved = set(message_ids)
+        for other_id, pending in self.pending_appends.items():
+            if other_id != task_id:
+                pending[:] = [m for m in pending if m not in moved]
+        self.pending_appends.setdefault(task_id, []).extend(message_ids)
+
+    async def flush(self) -> Result[None]:
+        """
+        Write every queued change. The queues are only cleared once all of them
+        are written: a failed flush is rolled back by the caller as a whole, so
+        nothing queued may be dropped until then.
+        """
+        if self.pending_inserts:
+            r = await TD.insert_tasks(
+                self.db_session, self.project_id, self.session_id, self.pending_inserts
+            )
+            if not r.ok():
+                return r
+        if self.pending_appends:
+            r = await TD.append_messages_to_tasks(
+                self.db_session, self.pending_appends
+            )
+            if not r.ok():
+                return r
+        for task_id, progress, user_preference in self.pending_progresses:
+            r = await TD.append_progress_to_task(
+                self.db_session, task_id, progress, user_preference
+            )
+            if not r.ok():
+                return r
+        for task_id in self.pending_running:
+            r = await TD.update_task(self.db_session, task_id, status="running")
+            if not r.ok():
+                return r
+        if self.pending_inserts:
+            asyncio.create_task(
+                capture_increment(
+                    project_id=self.project_id,
+                    tag=MetricTags.new_task_created,
+                    increment=len(self.pending_inserts),
+                )
+            )
+        self.pending_inserts.clear()
+        self.pending_appends.clear()
+        self.pending_progresses.clear()
+        self.pending_running.clear()
+        return Result.resolve(None)
@@ -1,35 +1,26 @@
-import asyncio
 from ..base import Tool
 from ....schema.llm import ToolSchema
 from ....schema.result import Result
-from ....service.data import task as TD
-from ....constants import MetricTags
-from ....telemetry.capture_metrics import capture_increment
 from .ctx import TaskCtx
 
 
 async def insert_task_handler(ctx: TaskCtx, llm_arguments: dict) -> Result[str]:
-    r = await TD.insert_task(
-        ctx.db_session,
-        ctx.project_id,
-        ctx.session_id,
-        after_order=llm_arguments["after_task_order"],
-        data={
-            "task_description": llm_arguments["task_description"],
-            "user_preferences": [],
-            "progresses": [],
-        },
-    )
-    t, eil = r.unpack()
-    if eil:
-        return r
-    asyncio.create_task(
-        capture_increment(
-            project_id=ctx.project_id,
-            tag=MetricTags.new_task_created,
+    after_order = llm_arguments["after_task_order"]
+    if after_order < 0:
+        return Result.reject(f"after_task_order must be >= 0, got {after_order}")
+    # inserted with the rest of the batch when the tool loop flushes the ctx;
+    # the new task takes after_order + 1 just as an immediate insert would
+    ctx.pending_inserts.append(
+        (
+            after_order,
+            {
+                "task_description": llm_arguments["task_description"],
+                "user_preferences": [],
+                "progresses": [],
+            },
         )
     )
-    return Result.resolve(f"Task {t.order} created")
+    return Result.resolve(f"Task {after_order + 1} created")
 
 
 _insert_task_tool = (
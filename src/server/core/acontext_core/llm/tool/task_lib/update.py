@@ -1,4 +1,3 @@
-import asyncio
 from ....infra.async_mq import MQ_CLIENT
 from ..base import Tool
 from ....schema.llm import ToolSchema
@@ -8,13 +7,16 @@ from ....schema.session.task import TaskStatus
 from ....service.data import task as TD
 from ....service.constants import EX, RK
 from .ctx import TaskCtx
+from .args import TaskOrderArg
 
 
-async def send_complete_new_task(body: NewTaskComplete):
-    await MQ_CLIENT.publish(
+def send_complete_new_task(body: NewTaskComplete) -> None:
+    # fire-and-forget through the client's bounded publish queue; the
+    # serializer hands back bytes, so the publisher doesn't re-encode a str
+    MQ_CLIENT.publish_nowait(
         exchange_name=EX.space_task,
         routing_key=RK.space_task_new_complete,
-        body=body.model_dump_json(),
+        body=NewTaskComplete.__pydantic_serializer__.to_json(body),
     )
 
 
@@ -22,41 +24,28 @@ async def update_task_handler(
     ctx: TaskCtx,
     llm_arguments: dict,
 ) -> Result[str]:
-    task_order = llm_arguments.get("task_order", None)
-    if not task_order:
-        return Result.resolve(
-            "You must provide a task order argument, so that we can update the task. Updating failed."
-        )
-    if task_order > len(ctx.task_ids_index) or task_order < 1:
-        return Result.resolve(
-            f"Task order {task_order} is out of range, updating failed."
-        )
-    actually_task_id = ctx.task_ids_index[task_order - 1]
+    task = TaskOrderArg.parse(ctx, llm_arguments, "updating")
+    if isinstance(task, Result):
+        return task
     task_status = llm_arguments.get("task_status", None)
     task_description = llm_arguments.get("task_description", None)
+    # most calls only move the status
+    patch_data = {"task_description": task_description} if task_description else None
     r = await TD.update_task(
         ctx.db_session,
-        actually_task_id,
+        task.task_id,
         status=task_status,
-        patch_data=(
-            {
-                "task_description": task_description,
-            }
-            if task_description
-            else None
-        ),
+        patch_data=patch_data,
     )
     t, eil = r.unpack()
     if eil:
         return r
     if task_status is not None and task_status == TaskStatus.SUCCESS.value:
-        asyncio.create_task(
-            send_complete_new_task(
-                NewTaskComplete(
-                    project_id=ctx.project_id,
-                    session_id=ctx.session_id,
-                    task_id=actually_task_id,
-                )
+        send_complete_new_task(
+            NewTaskComplete(
+                project_id=ctx.project_id,
+                session_id=ctx.session_id,
+                task_id=task.task_id,
             )
         )
     return Result.resolve(f"Task {t.order} updated")
@@ -1,9 +1,12 @@
+from enum import StrEnum
 from pydantic import BaseModel, Field
-from typing import Literal, Any, Optional
+from typing import Any, Optional
 from ..utils import asUUID
 
 
-SearchMode = Literal["fast", "agentic"]
+class SearchMode(StrEnum):
+    FAST = "fast"
+    AGENTIC = "agentic"
 
 
 class ToolRename(BaseModel):
@@ -1,4 +1,3 @@
-import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 from dataclasses import dataclass, field, fields
@@ -7,7 +6,7 @@ from sqlalchemy import Column
 from sqlalchemy.sql import func
 from sqlalchemy.types import DateTime
 
-from ..utils import asUUID
+from ..utils import asUUID, uuid7
 
 # Create the registry for dataclass ORM
 ORM_BASE = registry()
@@ -76,7 +75,7 @@ class CommonMixin(TimestampMixin):
             "db": Column(
                 UUID(as_uuid=True),
                 primary_key=True,
-                default=uuid.uuid4,
+                default=uuid7,
                 server_default=func.gen_random_uuid(),
             )
         },
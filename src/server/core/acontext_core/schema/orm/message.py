@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from sqlalchemy import String, ForeignKey, Index, CheckConstraint, Column
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import TYPE_CHECKING, Optional, List, Dict, Any, Literal
 from .base import ORM_BASE, CommonMixin
 from ..utils import asUUID
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 class Asset(BaseModel):
     """Asset model matching the GORM Asset struct - used for JSONB serialization only"""
 
+    model_config = ConfigDict(frozen=True)
+
     bucket: str
     s3_key: str
     etag: str
@@ -24,6 +26,8 @@ class Asset(BaseModel):
 
 
 class ToolCallMeta(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     arguments: dict | str
     id: Optional[str] = None
@@ -36,6 +40,8 @@ class ToolResultMeta(BaseModel):
 class Part(BaseModel):
     """Message part model matching the GORM Part struct"""
 
+    model_config = ConfigDict(frozen=True)
+
     type: Literal[
         "text", "image", "audio", "video", "file", "tool-call", "tool-result", "data"
     ]  # "text" | "image" | "audio" | "video" | "file" | "tool-call" | "tool-result" | "data"
@@ -65,9 +71,18 @@ class Message(CommonMixin):
             "session_task_process_status IN ('success', 'failed', 'running', 'pending')",
             name="ck_session_task_process_status",
         ),
-        Index("ix_message_session_id", "session_id"),
         Index("ix_message_parent_id", "parent_id"),
+        # same name as the API's GORM index, the task message lookups use it
+        Index("idx_messages_task_id", "task_id"),
         Index("idx_session_created", "session_id", "created_at"),
+        # pending/running scans of a session, answered from the index alone
+        Index(
+            "ix_message_session_status_created",
+            "session_id",
+            "session_task_process_status",
+            "created_at",
+            postgresql_include=["id"],
+        ),
     )
 
     session_id: asUUID = field(
@@ -97,6 +112,8 @@ class Message(CommonMixin):
             )
         },
     )
+    # no parent/children relationships: the FK cascades in the DB and
+    # walking the tree goes through service.data.message.fetch_message_children
 
     # Computed field for API responses (matches Go's Parts field with gorm:"-")
     # parts: List[Part] = field(default_factory=list, init=False)
@@ -119,31 +136,11 @@ class Message(CommonMixin):
 
     # Relationships
     session: "Session" = field(
-        init=False, metadata={"db": relationship("Session", back_populates="messages")}
-    )
-
-    parent: Optional["Message"] = field(
-        default=None,
-        init=False,
-        metadata={
-            "db": relationship(
-                "Message", remote_side="Message.id", back_populates="children"
-            )
-        },
-    )
-
-    children: List["Message"] = field(
-        default_factory=list,
-        init=False,
-        metadata={
-            "db": relationship(
-                "Message", back_populates="parent", cascade="all, delete-orphan"
-            )
-        },
+        init=False, metadata={"db": relationship("Session", back_populates="messages", lazy="raise")}
     )
 
     task: Optional["Task"] = field(
         default=None,
         init=False,
-        metadata={"db": relationship("Task", back_populates="messages")},
+        metadata={"db": relationship("Task", back_populates="messages", lazy="raise")},
     )
@@ -38,7 +38,6 @@ class Task(CommonMixin):
             "order",
             name="uq_session_id_order",
         ),
-        Index("ix_task_session_id", "session_id"),
         Index("ix_task_session_id_task_id", "session_id", "id"),
         Index("ix_task_session_id_status", "session_id", "status"),
         Index("ix_task_project_id", "project_id"),
@@ -96,15 +95,15 @@ class Task(CommonMixin):
     # Relationships
     messages: List["Message"] = field(
         default_factory=list,
-        metadata={"db": relationship("Message", back_populates="task")},
+        metadata={"db": relationship("Message", back_populates="task", lazy="raise")},
     )
 
     session: "Session" = field(
         init=False,
-        metadata={"db": relationship("Session", back_populates="tasks")},
+        metadata={"db": relationship("Session", back_populates="tasks", lazy="raise")},
     )
 
     project: "Project" = field(
         init=False,
-        metadata={"db": relationship("Project", back_populates="tasks")},
+        metadata={"db": relationship("Project", back_populates="tasks", lazy="raise")},
     )
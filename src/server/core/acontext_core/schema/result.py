@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from dataclasses import dataclass
 from typing import Generic, TypeVar, Type, Optional, Union
 from .error_code import Code
 from ..env import LOG
@@ -10,7 +10,8 @@ class ResultError(Exception):
     pass
 
 
-class Error(BaseModel):
+@dataclass(slots=True, frozen=True)
+class Error:
     status: Code = Code.SUCCESS
     errmsg: str = ""
 
@@ -22,14 +23,18 @@ class Error(BaseModel):
         return f"Error(status={self.status}, errmsg={self.errmsg})"
 
 
-class Result(BaseModel, Generic[T]):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+# frozen, so every successful Result can share it
+_NO_ERROR = Error()
+
+
+@dataclass(slots=True, frozen=True)
+class Result(Generic[T]):
     data: Optional[T]
-    error: Error
+    error: Error = _NO_ERROR
 
     @classmethod
     def resolve(cls, data: T) -> "Result[T]":
-        return cls(data=data, error=Error())
+        return cls(data=data)
 
     @classmethod
     def reject(cls, errmsg: str, status: Code = Code.INTERNAL_ERROR) -> "Result[T]":
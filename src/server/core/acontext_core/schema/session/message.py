@@ -1,5 +1,5 @@
 import json
-from pydantic import BaseModel
+from dataclasses import dataclass
 from typing import List, Optional
 from ..orm import Part, ToolCallMeta, ToolResultMeta
 from ...env import LOG
@@ -66,7 +66,10 @@ def pack_part_line(
     return r[:truncate_chars] + "[...truncated]"
 
 
-class MessageBlob(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MessageBlob:
+    """Read-only view of a stored message, built from trusted DB rows without validation"""
+
     message_id: asUUID
     role: str
     parts: List[Part]
@@ -1,7 +1,6 @@
 from ..data import message as MD
 from ...infra.db import DB_CLIENT
 from ...schema.session.task import TaskStatus
-from ...schema.session.message import MessageBlob
 from ...schema.utils import asUUID
 from ...schema.result import Result
 from ...llm.agent import task as AT
@@ -15,43 +14,34 @@ async def process_session_pending_message(
     pending_message_ids = None
     try:
         async with DB_CLIENT.get_session_context() as session:
-            r = await MD.get_message_ids(
+            r = await MD.unpending_session_messages_to_running(
                 session,
                 session_id,
                 limit=(
                     project_config.project_session_message_buffer_max_overflow
                     + project_config.project_session_message_buffer_max_turns
                 ),
-                asc=True,
             )
-            pending_message_ids, eil = r.unpack()
+            claimed, eil = r.unpack()
             if eil:
                 return r
-            if not pending_message_ids:
+            if not claimed:
                 return Result.resolve(None)
-            await MD.update_message_status_to(
-                session, pending_message_ids, TaskStatus.RUNNING
+            pending_message_ids = [row.id for row in claimed]
+            # make RUNNING visible before the slow part, then keep the session
+            await session.commit()
+            LOG.info(
+                f"Unpending {len(pending_message_ids)} session messages to process"
             )
-        LOG.info(f"Unpending {len(pending_message_ids)} session messages to process")
 
-        async with DB_CLIENT.get_session_context() as session:
-            r = await MD.fetch_messages_data_by_ids(session, pending_message_ids)
-            messages, eil = r.unpack()
+            r = await MD.message_blobs_from_rows(claimed)
+            messages_data, eil = r.unpack()
             if eil:
-                return r
-
-            r = await MD.fetch_previous_messages_by_datetime(
-                session,
-                session_id,
-                messages[0].created_at,
-                limit=project_config.project_session_message_use_previous_messages_turns,
-            )
-            messages_data = [
-                MessageBlob(
-                    message_id=m.id, role=m.role, parts=m.parts, task_id=m.task_id
+                # don't leave the claimed messages RUNNING
+                await MD.update_message_status_to(
+                    session, pending_message_ids, TaskStatus.FAILED
                 )
-                for m in messages
-            ]
+                return r
 
         r = await AT.task_agent_curd(
             project_id,
@@ -70,7 +60,7 @@ async def process_session_pending_message(
             )
         return r
     except Exception as e:
-        if pending_message_ids is None:
+        if not pending_message_ids:
             raise e
         LOG.error(
             f"Exception while processing session pending message: {e}, rollback {len(pending_message_ids)} message status to failed"
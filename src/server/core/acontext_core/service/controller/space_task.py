@@ -1,7 +1,6 @@
 from ..data import message as MD
 from ...infra.db import DB_CLIENT
 from ...schema.session.task import TaskStatus
-from ...schema.session.message import MessageBlob
 from ...schema.utils import asUUID
 from ...llm.agent import task_sop as TSOP
 from ...env import LOG
@@ -24,14 +23,10 @@ async def process_space_task(
     async with DB_CLIENT.get_session_context() as db_session:
         # 1. fetch messages from task
         msg_ids = task.raw_message_ids
-        r = await MD.fetch_messages_data_by_ids(db_session, msg_ids)
+        r = await MD.fetch_message_blobs_by_ids(db_session, msg_ids)
         if not r.ok():
             return
-        messages, _ = r.unpack()
-        messages_data = [
-            MessageBlob(message_id=m.id, role=m.role, parts=m.parts, task_id=m.task_id)
-            for m in messages
-        ]
+        messages_data, _ = r.unpack()
     async with DB_CLIENT.get_session_context() as db_session:
         r = await TD.fetch_previous_tasks_without_message_ids(
             db_session,
@@ -68,38 +68,49 @@ async def write_sop_block_to_parent(
     db_session.add(new_block)
     await db_session.flush()
 
-    for i, sop_step in enumerate(sop_data.tool_sops):
+    tool_names = []
+    for sop_step in sop_data.tool_sops:
         tool_name = sop_step.tool_name.strip()
         if not tool_name:
             return Result.reject("Tool name is empty")
-        tool_name = tool_name.lower()
-        # Try to find existing ToolReference
+        tool_names.append(tool_name.lower())
+
+    # Find existing ToolReferences in one query, create the missing ones in one flush
+    tool_refs = {}
+    if tool_names:
         tool_ref_query = (
             select(ToolReference)
             .where(ToolReference.project_id == project_id)
-            .where(ToolReference.name == tool_name)
+            .where(ToolReference.name.in_(set(tool_names)))
         )
         result = await db_session.execute(tool_ref_query)
-        tool_reference = result.scalars().first()
+        for tool_reference in result.scalars():
+            tool_refs.setdefault(tool_reference.name, tool_reference)
+        new_refs = [
+            ToolReference(name=name, project_id=project_id)
+            for name in dict.fromkeys(tool_names)
+            if name not in tool_refs
+        ]
+        if new_refs:
+            db_session.add_all(new_refs)
+            await db_session.flush()  # Flush to get the tool_reference IDs
+            tool_refs.update((ref.name, ref) for ref in new_refs)
 
-        # If ToolReference doesn't exist, create it
-        if tool_reference is None:
-            tool_reference = ToolReference(
-                name=tool_name,
-                project_id=project_id,
+    # Create ToolSOP entries linking tools to the SOP block
+    db_session.add_all(
+        [
+            ToolSOP(
+                order=i,
+                action=sop_step.action,  # The action describes what to do with the tool
+                tool_reference_id=tool_refs[tool_name].id,
+                sop_block_id=new_block.id,
+                props=None,  # Or store additional metadata if needed
             )
-            db_session.add(tool_reference)
-            await db_session.flush()  # Flush to get the tool_reference ID
-
-        # Create ToolSOP entry linking tool to the SOP block
-        tool_sop = ToolSOP(
-            order=i,
-            action=sop_step.action,  # The action describes what to do with the tool
-            tool_reference_id=tool_reference.id,
-            sop_block_id=new_block.id,
-            props=None,  # Or store additional metadata if needed
-        )
-        db_session.add(tool_sop)
+            for i, (sop_step, tool_name) in enumerate(
+                zip(sop_data.tool_sops, tool_names)
+            )
+        ]
+    )
 
     await db_session.flush()
     r = await create_new_block_embedding(db_session, new_block, sop_data.use_when)
@@ -1,25 +1,77 @@
 import asyncio
-import json
-from typing import List
-from sqlalchemy import select, func
+import functools
+from collections import OrderedDict
+from typing import List, Optional
+from sqlalchemy import Row, select, func, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 from datetime import datetime
 from sqlalchemy import update
 from ...schema.session.task import TaskStatus
 from ...schema.orm import Message, Part, Asset
+from ...schema.session.message import MessageBlob
 from ...schema.result import Result
 from ...schema.utils import asUUID
 from ...infra.s3 import S3_CLIENT
+from ...infra.redis import REDIS_CLIENT
 from ...env import LOG
 
+# built once: parts are decoded straight from the downloaded bytes
+_PARTS_ADAPTER = TypeAdapter(List[Part])
+_UUID_ARRAY = ARRAY(UUID(as_uuid=True))
+_PARTS_CACHE_MAX = 1024
+_PARTS_CACHE: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+# parts JSON cached by the API, keyed by the sha256 of the S3 object
+_REDIS_PARTS_PREFIX = "message:parts:"
+# everything a MessageBlob is built from
+_BLOB_COLUMNS = (Message.id, Message.role, Message.parts_asset_meta, Message.task_id)
+
+
+def _forget_failed_parts(s3_key: str, fut: asyncio.Future) -> None:
+    if fut.cancelled() or fut.exception() is not None or not fut.result().ok():
+        if _PARTS_CACHE.get(s3_key) is fut:
+            del _PARTS_CACHE[s3_key]
+
+
+async def _get_cached_parts_json(sha256: str) -> Optional[str]:
+    if not sha256:
+        return None
+    try:
+        async with REDIS_CLIENT.get_client_context() as client:
+            return await client.get(_REDIS_PARTS_PREFIX + sha256)
+    except Exception as e:
+        LOG.debug(f"Parts cache lookup failed for {sha256}, falling back to S3: {e}")
+        return None
+
+
+async def _load_message_parts(asset: Asset) -> Result[List[Part]]:
+    # the API caches freshly written parts in Redis, which saves the S3 round-trip
+    # for messages processed soon after they arrive
+    cached = await _get_cached_parts_json(asset.sha256)
+    if cached is not None:
+        try:
+            return Result.resolve(_PARTS_ADAPTER.validate_json(cached))
+        except ValidationError as e:
+            LOG.warning(f"Ignoring invalid cached parts of {asset.s3_key}: {e}")
+    parts_json_bytes = await S3_CLIENT.download_object_bytearray(asset.s3_key)
+    try:
+        parts = _PARTS_ADAPTER.validate_json(parts_json_bytes)
+    except ValidationError as e:
+        return Result.reject(f"Failed to validate parts of {asset.s3_key}: {e}")
+    return Result.resolve(parts)
+
 
 async def _fetch_message_parts(parts_meta: dict) -> Result[List[Part]]:
     """
     Helper function to fetch parts for a single message from S3.
 
+    Parts objects are content-addressed, so loads are shared by s3_key: concurrent
+    callers wait on the same download and recent keys are served from memory.
+    Failed loads are not cached.
+
     Args:
-        message: Message object with parts_meta containing S3 information
+        parts_meta: Message.parts_asset_meta pointing at the parts JSON in S3
 
     Returns:
         List of Part objects
@@ -31,15 +83,18 @@ async def _fetch_message_parts(parts_meta: dict) -> Result[List[Part]]:
         except ValidationError as e:
             return Result.reject(f"Failed to validate parts asset {parts_meta}: {e}")
         s3_key = asset.s3_key
-        # Download parts JSON from S3
-        parts_json_bytes = await S3_CLIENT.download_object(s3_key)
-        parts_json = json.loads(parts_json_bytes.decode("utf-8"))
-        assert isinstance(parts_json, list), "Parts Json must be a list"
-        try:
-            parts = [Part(**pj) for pj in parts_json]
-        except ValidationError as e:
-            return Result.reject(f"Failed to validate parts {parts_json}: {e}")
-        return Result.resolve(parts)
+        fut = _PARTS_CACHE.get(s3_key)
+        if fut is not None:
+            _PARTS_CACHE.move_to_end(s3_key)
+        else:
+            # Load parts JSON from the cache or S3
+            fut = asyncio.ensure_future(_load_message_parts(asset))
+            fut.add_done_callback(functools.partial(_forget_failed_parts, s3_key))
+            _PARTS_CACHE[s3_key] = fut
+            if len(_PARTS_CACHE) > _PARTS_CACHE_MAX:
+                _PARTS_CACHE.popitem(last=False)
+        # one caller being cancelled must not cancel the shared load
+        return await asyncio.shield(fut)
     except Exception as e:
         return Result.reject(f"Unknown error to fetch parts {parts_meta}: {e}")
 
@@ -127,6 +182,62 @@ async def fetch_messages_data_by_ids(
         return Result.reject(f"Error fetching messages by IDs {message_ids}: {e}")
 
 
+async def message_blobs_from_rows(rows: List[Row]) -> Result[List[MessageBlob]]:
+    """
+    Build MessageBlobs from (id, role, parts_asset_meta, task_id) rows, keeping their order.
+
+    Needs no DB session: the parts come from the cache or S3, so this can run while
+    the caller's session is busy with something else.
+    Fails if the parts of any message can't be loaded.
+    """
+    try:
+        parts_results = await asyncio.gather(
+            *(_fetch_message_parts(row.parts_asset_meta) for row in rows)
+        )
+        blobs = []
+        for row, parts_result in zip(rows, parts_results):
+            parts, eil = parts_result.unpack()
+            if eil:
+                return Result.reject(
+                    f"Failed to load parts of message {row.id}: {eil.errmsg}"
+                )
+            blobs.append(
+                MessageBlob(
+                    message_id=row.id, role=row.role, parts=parts, task_id=row.task_id
+                )
+            )
+        return Result.resolve(blobs)
+
+    except Exception as e:
+        return Result.reject(f"Error loading message blobs: {e}")
+
+
+async def fetch_message_blobs_by_ids(
+    db_session: AsyncSession, message_ids: List[asUUID]
+) -> Result[List[MessageBlob]]:
+    """
+    Fetch messages by their IDs as MessageBlobs, in the order of message_ids.
+
+    Only the columns a MessageBlob needs are selected, so no ORM instances are built.
+    Fails if any message is missing or its parts can't be loaded from S3.
+    """
+    try:
+        if not message_ids:
+            return Result.resolve([])
+
+        query = select(*_BLOB_COLUMNS).where(Message.id.in_(message_ids))
+        result = await db_session.execute(query)
+        rows = {row.id: row for row in result.all()}
+        missing = [msg_id for msg_id in message_ids if msg_id not in rows]
+        if missing:
+            return Result.reject(f"Some messages({missing}) not found in database")
+
+    except Exception as e:
+        return Result.reject(f"Error fetching message blobs by IDs {message_ids}: {e}")
+
+    return await message_blobs_from_rows([rows[msg_id] for msg_id in message_ids])
+
+
 async def fetch_session_messages(
     db_session: AsyncSession, session_id: asUUID, status: str = "pending"
 ) -> Result[List[Message]]:
@@ -181,23 +292,56 @@ async def get_message_ids(
     return Result.resolve(message_ids)
 
 
+async def fetch_message_children(
+    db_session: AsyncSession, message_id: asUUID
+) -> Result[List[Message]]:
+    """
+    Fetch the direct children of a message, oldest first.
+    """
+    query = (
+        select(Message)
+        .where(Message.parent_id == message_id)
+        .order_by(Message.created_at.asc())
+    )
+    result = await db_session.execute(query)
+    return Result.resolve(list(result.scalars().all()))
+
+
 async def unpending_session_messages_to_running(
     db_session: AsyncSession, session_id: asUUID, limit: int
-) -> Result[List[asUUID]]:
-    query = (
-        update(Message)
+) -> Result[List[Row]]:
+    """
+    Claim up to `limit` of the oldest pending messages of a session by flipping them to running.
+
+    Rows locked by another worker are skipped instead of waited on.
+
+    Returns:
+        Result containing the claimed (id, role, parts_asset_meta, task_id) rows, oldest
+        first, ready for message_blobs_from_rows
+    """
+    claim = (
+        select(Message.id)
         .where(
             Message.session_id == session_id,
             Message.session_task_process_status == TaskStatus.PENDING.value,
         )
+        .order_by(Message.created_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = (
+        update(Message)
+        .where(Message.id.in_(claim.scalar_subquery()))
         .values(session_task_process_status=TaskStatus.RUNNING.value)
-        .returning(Message.id, Message.created_at)
+        .returning(*_BLOB_COLUMNS, Message.created_at)
+        .cte("claimed")
     )
+    # RETURNING has no order of its own, sort the claimed rows in the same statement
+    query = select(
+        *(claimed.c[c.key] for c in _BLOB_COLUMNS)
+    ).order_by(claimed.c.created_at)
     result = await db_session.execute(query)
-    rdp = sorted(result.mappings().all(), key=lambda x: x["created_at"])
-    message_ids = [rdp["id"] for rdp in rdp]
-    await db_session.flush()
-    return Result.resolve(message_ids)
+    return Result.resolve(list(result.all()))
 
 
 async def check_session_message_status(
@@ -227,8 +371,8 @@ async def fetch_previous_messages_by_datetime(
         .limit(limit)
     )
     result = await db_session.execute(query)
-    _dp = sorted(result.all(), key=lambda x: x[1])
-    message_ids = [dp[0] for dp in _dp]
+    # newest first from the index, flip to chronological order
+    message_ids = [row.id for row in reversed(result.all())]
 
     return await fetch_messages_data_by_ids(db_session, message_ids)
 
@@ -237,20 +381,27 @@ async def update_message_status_to(
     db_session: AsyncSession, message_ids: List[asUUID], status: TaskStatus
 ) -> Result[bool]:
     """
-    Rollback message status from 'running' to 'pending' for retry.
+    Set the process status of messages, e.g. rollback from 'running' to 'pending' for retry.
 
     Args:
         db_session: Database session
-        message_ids: List of message IDs to rollback
+        message_ids: List of message IDs to update
+        status: Status to set
 
     Returns:
         Result indicating success or failure
     """
 
-    # Update all messages in one query
+    if not message_ids:
+        return Result.resolve(True)
+
+    # One UPDATE with the ids bound as a single array parameter, so the
+    # prepared statement is the same whatever the number of ids
     stmt = (
         update(Message)
-        .where(Message.id.in_(message_ids))
+        .where(
+            Message.id == any_(bindparam("message_ids", message_ids, type_=_UUID_ARRAY))
+        )
         .values(session_task_process_status=status.value)
     )
 
@@ -1,93 +1,80 @@
 from typing import List
-from sqlalchemy import select, delete, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.ext.asyncio import AsyncSession
 from ...env import LOG
 from ...schema.orm import Task, Message
 from ...schema.result import Result
 from ...schema.utils import asUUID
-from ...schema.session.task import TaskSchema
+from ...schema.session.task import TaskSchema, TaskData, TaskStatus
+
+
+def _raw_message_ids_column():
+    """Ids of a task's messages in creation order, aggregated in the task's own row"""
+    return (
+        select(
+            func.array_agg(aggregate_order_by(Message.id, Message.created_at.asc()))
+        )
+        .where(Message.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+        .label("raw_message_ids")
+    )
+
+
+def _task_schema(task: Task, raw_message_ids: List[asUUID] | None) -> TaskSchema:
+    """
+    The columns are already typed by the DB, so only the JSONB data is validated
+    """
+    return TaskSchema.model_construct(
+        id=task.id,
+        session_id=task.session_id,
+        order=task.order,
+        status=TaskStatus(task.status),
+        data=TaskData.model_validate(task.data),
+        space_digested=task.space_digested,
+        raw_message_ids=raw_message_ids or [],
+    )
 
 
 async def fetch_planning_task(
     db_session: AsyncSession, session_id: asUUID
 ) -> Result[TaskSchema | None]:
     query = (
-        select(Task)
+        select(Task, _raw_message_ids_column())
         .where(Task.session_id == session_id)
-        .options(selectinload(Task.messages))
         .where(Task.is_planning == True)  # noqa: E712
     )
     result = await db_session.execute(query)
-    planning = result.scalars().first()
-    if planning is None:
+    row = result.first()
+    if row is None:
         return Result.resolve(None)
-    return Result.resolve(
-        TaskSchema(
-            id=planning.id,
-            session_id=planning.session_id,
-            order=planning.order,
-            status=planning.status,
-            data=planning.data,
-            space_digested=planning.space_digested,
-            raw_message_ids=[
-                msg.id for msg in sorted(planning.messages, key=lambda m: m.created_at)
-            ],
-        )
-    )
+    return Result.resolve(_task_schema(*row))
 
 
 async def fetch_task(db_session: AsyncSession, task_id: asUUID) -> Result[TaskSchema]:
-    query = select(Task).where(Task.id == task_id).options(selectinload(Task.messages))
+    query = select(Task, _raw_message_ids_column()).where(Task.id == task_id)
     result = await db_session.execute(query)
-    task = result.scalars().first()
-    if task is None:
+    row = result.first()
+    if row is None:
         return Result.reject(f"Task {task_id} not found")
-    return Result.resolve(
-        TaskSchema(
-            id=task.id,
-            session_id=task.session_id,
-            order=task.order,
-            status=task.status,
-            data=task.data,
-            space_digested=task.space_digested,
-            raw_message_ids=[
-                msg.id for msg in sorted(task.messages, key=lambda m: m.created_at)
-            ],
-        )
-    )
+    return Result.resolve(_task_schema(*row))
 
 
 async def fetch_current_tasks(
     db_session: AsyncSession, session_id: asUUID, status: str = None
 ) -> Result[List[TaskSchema]]:
     query = (
-        select(Task)
+        select(Task, _raw_message_ids_column())
         .where(Task.session_id == session_id)
         .where(Task.is_planning == False)  # noqa: E712
-        .options(selectinload(Task.messages))  # Eagerly load related messages
         .order_by(Task.order.asc())
     )
     if status:
         query = query.where(Task.status == status)
     result = await db_session.execute(query)
-    tasks = list(result.scalars().all())
-    tasks_d = [
-        TaskSchema(
-            id=t.id,
-            session_id=t.session_id,
-            order=t.order,
-            status=t.status,
-            data=t.data,
-            space_digested=t.space_digested,
-            raw_message_ids=[
-                msg.id for msg in sorted(t.messages, key=lambda m: m.created_at)
-            ],
-        )
-        for t in tasks
-    ]
-    return Result.resolve(tasks_d)
+    return Result.resolve([_task_schema(*row) for row in result.all()])
 
 
 async def update_task(
@@ -187,6 +174,70 @@ async def insert_task(
     return Result.resolve(task)
 
 
+async def insert_tasks(
+    db_session: AsyncSession,
+    project_id: asUUID,
+    session_id: asUUID,
+    inserts: list[tuple[int, dict]],
+    status: str = "pending",
+) -> Result[list[Task]]:
+    """
+    Batched insert_task: the (after_order, data) pairs end up as if insert_task
+    were called for each in turn, in a fixed number of round-trips.
+    Locks the session's tasks like insert_task does.
+    """
+    assert all(after_order >= 0 for after_order, _ in inserts)
+    if not inserts:
+        return Result.resolve([])
+    lock_query = (
+        select(Task.id, Task.order)
+        .where(Task.session_id == session_id)
+        .with_for_update()
+    )
+    result = await db_session.execute(lock_query)
+    existing = {task_id: order for task_id, order in result.all()}
+
+    # replay the inserts on the orders
+    orders = dict(existing)
+    new_orders: list[int] = []
+    for after_order, _ in inserts:
+        for task_id, order in orders.items():
+            if order > after_order:
+                orders[task_id] = order + 1
+        new_orders = [o + 1 if o > after_order else o for o in new_orders]
+        new_orders.append(after_order + 1)
+
+    moved = [
+        {"id": task_id, "order": -order}
+        for task_id, order in orders.items()
+        if order != existing[task_id]
+    ]
+    if moved:
+        # park the moved tasks on negative orders first, as insert_task does,
+        # so no intermediate state violates uq_session_id_order
+        await db_session.execute(update(Task), moved)
+        await db_session.execute(
+            update(Task)
+            .where(Task.session_id == session_id)
+            .where(Task.order < 0)
+            .values(order=-Task.order)
+        )
+
+    tasks = [
+        Task(
+            session_id=session_id,
+            project_id=project_id,
+            order=order,
+            data=data,
+            status=status,
+        )
+        for order, (_, data) in zip(new_orders, inserts)
+    ]
+    db_session.add_all(tasks)
+    await db_session.flush()
+    return Result.resolve(tasks)
+
+
 async def delete_task(db_session: AsyncSession, task_id: asUUID) -> Result[None]:
     # Fetch the task to delete
     await db_session.execute(delete(Task).where(Task.id == task_id))
@@ -206,6 +257,23 @@ async def append_messages_to_task(
     return Result.resolve(None)
 
 
+async def append_messages_to_tasks(
+    db_session: AsyncSession,
+    task_messages: dict[asUUID, list[asUUID]],
+) -> Result[None]:
+    """Batched append_messages_to_task: every link goes out in one executemany"""
+    links = [
+        {"id": message_id, "task_id": task_id}
+        for task_id, message_ids in task_messages.items()
+        for message_id in message_ids
+    ]
+    if not links:
+        return Result.resolve(None)
+    await db_session.execute(update(Message), links)
+    await db_session.flush()
+    return Result.resolve(None)
+
+
 async def append_progress_to_task(
     db_session: AsyncSession,
     task_id: asUUID,
@@ -304,17 +372,4 @@ async def fetch_previous_tasks_without_message_ids(
     result = await db_session.execute(query)
     tasks = list(result.scalars().all())
     tasks = sorted(tasks, key=lambda t: t.order)
-    return Result.resolve(
-        [
-            TaskSchema(
-                id=t.id,
-                session_id=t.session_id,
-                order=t.order,
-                status=t.status,
-                data=t.data,
-                space_digested=t.space_digested,
-                raw_message_ids=[],
-            )
-            for t in tasks
-        ]
-    )
+    return Result.resolve([_task_schema(t, []) for t in tasks])
@@ -40,7 +40,7 @@ async def waiting_for_message_notify(wait_for_seconds: int, body: InsertNewMessa
 )
 async def insert_new_message(body: InsertNewMessage, message: Message):
     LOG.debug(f"Insert new message {body.message_id}")
-    async with DB_CLIENT.get_session_context() as read_session:
+    async with DB_CLIENT.get_readonly_session_context() as read_session:
         r = await MD.get_message_ids(read_session, body.session_id)
         message_ids, eil = r.unpack()
         if eil:
@@ -140,7 +140,7 @@ register_consumer(
     ),
 )
 async def buffer_new_message(body: InsertNewMessage, message: Message):
-    async with DB_CLIENT.get_session_context() as session:
+    async with DB_CLIENT.get_readonly_session_context() as session:
         r = await MD.get_message_ids(session, body.session_id)
         message_ids, eil = r.unpack()
         if eil:
@@ -200,7 +200,7 @@ async def flush_session_message_blocking(
         )
 
     try:
-        async with DB_CLIENT.get_session_context() as read_session:
+        async with DB_CLIENT.get_readonly_session_context() as read_session:
             r = await PD.get_project_config(read_session, project_id)
             project_config, eil = r.unpack()
             if eil:
@@ -167,7 +167,7 @@ async def search_space(
     limit: int = Query(
         10, ge=1, le=50, description="Maximum number of results to return"
     ),
-    mode: SearchMode = Query("fast", description="Search query for page/folder titles"),
+    mode: SearchMode = Query(SearchMode.FAST, description="Search query for page/folder titles"),
     semantic_threshold: Optional[float] = Query(
         None,
         ge=0.0,
@@ -181,12 +181,12 @@ async def search_space(
         description="Maximum number of iterations for agentic search",
     ),
 ) -> SpaceSearchResult:
-    if mode == "fast":
+    if mode == SearchMode.FAST:
         cited_blocks = await semantic_grep_search_func(
             semantic_threshold, project_id, space_id, query, limit
         )
         return SpaceSearchResult(cited_blocks=cited_blocks, final_answer=None)
-    elif mode == "agentic":
+    elif mode == SearchMode.AGENTIC:
         r = await SS.space_agent_search(
             project_id,
             space_id,
@@ -283,7 +283,7 @@ async def project_tool_rename(
 async def get_project_tool_names(
     project_id: asUUID = Path(..., description="Project ID to get tool names within"),
 ) -> List[ToolReferenceData]:
-    async with DB_CLIENT.get_session_context() as db_session:
+    async with DB_CLIENT.get_readonly_session_context() as db_session:
         r = await TT.get_tool_names(db_session, project_id)
         if not r.ok():
             raise HTTPException(status_code=500, detail=r.error)
@@ -300,7 +300,7 @@ async def get_learning_status(
     Returns the count of space digested tasks and not space digested tasks.
     If the session is not connected to a space, returns 0 and 0.
     """
-    async with DB_CLIENT.get_session_context() as db_session:
+    async with DB_CLIENT.get_readonly_session_context() as db_session:
         # Fetch the session to check if it's connected to a space
         r = await SD.fetch_session(db_session, session_id)
         if not r.ok():
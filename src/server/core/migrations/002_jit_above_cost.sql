@@ -0,0 +1,21 @@
+-- Migration: Raise the JIT cost threshold instead of disabling JIT per connection
+-- Date: 2026-10-15
+-- Description: The core service used to connect with jit=off. JIT now stays enabled so
+-- expensive analytical queries can use it, while short OLTP queries stay below the threshold.
+
+BEGIN;
+
+DO $$
+BEGIN
+    EXECUTE format(
+        'ALTER DATABASE %I SET jit_above_cost = 1000000',
+        current_database()
+    );
+END
+$$;
+
+COMMIT;
+
+-- Applies to new connections. Verify with:
+-- SHOW jit_above_cost;
+-- Expected: 1e+06
@@ -0,0 +1,17 @@
+-- Migration: Index messages by (session_id, session_task_process_status, created_at)
+-- Date: 2026-10-15
+-- Description: The core service looks up a session's pending messages ordered by creation
+-- time on every buffer check. idx_session_created can't filter on the status, so every
+-- processed message of the session was visited as well. The new index covers the filter
+-- and the order, and INCLUDEs id so the lookup is an index-only scan.
+
+-- CREATE INDEX CONCURRENTLY can't run inside a transaction block, so no BEGIN/COMMIT here
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_message_session_status_created
+ON messages (session_id, session_task_process_status, created_at)
+INCLUDE (id);
+
+-- Verify with:
+-- EXPLAIN SELECT id FROM messages
+-- WHERE session_id = '<uuid>' AND session_task_process_status = 'pending'
+-- ORDER BY created_at LIMIT 32;
+-- Expected: Index Only Scan using ix_message_session_status_created
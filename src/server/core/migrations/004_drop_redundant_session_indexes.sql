@@ -0,0 +1,17 @@
+-- Migration: Drop single-column session_id indexes on tasks and messages
+-- Date: 2026-10-15
+-- Description: Each of these indexes is a leading prefix of a composite index on the same
+-- table, which serves the same session_id lookups. They only cost storage, buffer cache
+-- and write amplification on every insert.
+--   tasks:    ix_task_session_id      <- ix_task_session_id_task_id, ix_task_session_id_status, uq_session_id_order
+--   messages: ix_message_session_id   <- idx_session_created, ix_message_session_status_created
+--   messages: idx_messages_session_id (created by the API's GORM auto-migration) <- same
+
+-- DROP INDEX CONCURRENTLY can't run inside a transaction block, so no BEGIN/COMMIT here
+DROP INDEX CONCURRENTLY IF EXISTS ix_task_session_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_message_session_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_messages_session_id;
+
+-- Verify with:
+-- EXPLAIN SELECT * FROM tasks WHERE session_id = '<uuid>';
+-- Expected: Index Scan using one of the composite session_id indexes
@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.orm import selectinload
 from acontext_core.infra.db import DatabaseClient
 from acontext_core.schema.orm import Project, Space, Session, Block
@@ -138,3 +138,52 @@ async def test_db():
         
         print(f"Block test passed: page={page_block.id}, text={text_block.id}")
         print("✓ Self-referential relationships are working correctly!")
+
+
+@pytest.mark.asyncio
+async def test_readonly_session_does_not_commit():
+    db_client = DatabaseClient()
+    await db_client.create_tables()
+
+    async with db_client.get_readonly_session_context() as session:
+        assert session.autoflush is False
+        p = Project(secret_key_hmac="b" * 32, secret_key_hash_phc="b" * 32)
+        session.add(p)
+        await session.flush()
+        pid = p.id
+
+    async with db_client.get_session_context() as session:
+        assert await session.get(Project, pid) is None
+    await db_client.close()
+
+
+@pytest.mark.asyncio
+async def test_engine_is_created_lazily():
+    db_client = DatabaseClient()
+    assert db_client.get_pool_status() == {"status": "engine_not_initialized"}
+
+    async with db_client.get_readonly_session_context() as session:
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
+    assert db_client.get_pool_status() != {"status": "engine_not_initialized"}
+
+    await db_client.close()
+    assert db_client.get_pool_status() == {"status": "engine_not_initialized"}
+
+
+@pytest.mark.asyncio
+async def test_jsonb_round_trips_through_orjson():
+    import uuid
+    from sqlalchemy import bindparam
+    from sqlalchemy.dialects.postgresql import JSONB
+
+    db_client = DatabaseClient()
+    value = {"id": uuid.UUID(int=1), 1: "int key", "nested": [1.5, None, "é"]}
+    async with db_client.get_readonly_session_context() as session:
+        # stdlib json would refuse the UUID
+        r = await session.execute(select(bindparam("v", value, type_=JSONB)))
+        assert r.scalar() == {
+            "id": "00000000-0000-0000-0000-000000000001",
+            "1": "int key",
+            "nested": [1.5, None, "é"],
+        }
+    await db_client.close()
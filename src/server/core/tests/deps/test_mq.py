@@ -0,0 +1,213 @@
+import asyncio
+import pytest
+from aio_pika.exceptions import ChannelNotFoundEntity
+
+from acontext_core.infra.async_mq import (
+    AsyncSingleThreadMQConsumer,
+    ConnectionConfig,
+    ConsumerConfig,
+    MessageAckBatcher,
+    SpecialHandler,
+)
+
+
+class FakeMessage:
+    def __init__(self, delivery_tag: int, log: list):
+        self.delivery_tag = delivery_tag
+        self.processed = False
+        self._log = log
+
+    async def ack(self, multiple: bool = False):
+        self.processed = True
+        self._log.append(("ack", self.delivery_tag, multiple))
+
+    async def reject(self, requeue: bool = False):
+        self.processed = True
+        self._log.append(("reject", self.delivery_tag, requeue))
+
+
+@pytest.mark.asyncio
+async def test_ack_batcher_coalesces_contiguous_acks():
+    log = []
+    batcher = MessageAckBatcher(batch_size=3, interval_ms=5)
+    messages = [FakeMessage(tag, log) for tag in range(1, 4)]
+    for m in messages:
+        batcher.track(m)
+
+    for m in messages:
+        async with batcher.process(m):
+            pass
+
+    assert log == [("ack", 3, True)]
+
+
+@pytest.mark.asyncio
+async def test_ack_batcher_acks_around_pending_and_rejected():
+    log = []
+    batcher = MessageAckBatcher(batch_size=100, interval_ms=5)
+    m1, m2, m3, m4 = [FakeMessage(tag, log) for tag in range(1, 5)]
+    for m in (m1, m2, m3, m4):
+        batcher.track(m)
+
+    async with batcher.process(m1):
+        pass
+    with pytest.raises(ValueError):
+        async with batcher.process(m3):
+            raise ValueError("boom")
+    async with batcher.process(m4):
+        pass
+    await batcher.flush()
+
+    # m2 is still running: m1 goes out as a batch, m4 is acked on its own
+    assert log == [("reject", 3, False), ("ack", 4, False), ("ack", 1, True)]
+
+    log.clear()
+    async with batcher.process(m2):
+        pass
+    await batcher.flush()
+    assert log == [("ack", 2, True)]
+
+
+@pytest.mark.asyncio
+async def test_ack_batcher_prunes_reject_only_deliveries():
+    log = []
+    batcher = MessageAckBatcher(batch_size=100, interval_ms=1)
+    messages = [FakeMessage(tag, log) for tag in range(1, 4)]
+    for m in messages:
+        batcher.track(m)
+        with pytest.raises(ValueError):
+            async with batcher.process(m):
+                raise ValueError("poison")
+
+    runner = asyncio.create_task(batcher.run())
+    try:
+        await asyncio.sleep(0.05)
+    finally:
+        runner.cancel()
+    assert batcher._deliveries == {}
+    assert log == [("reject", tag, False) for tag in range(1, 4)]
+
+
+@pytest.mark.asyncio
+async def test_publish_coalesces_same_tick_calls():
+    client = AsyncSingleThreadMQConsumer(ConnectionConfig(url="amqp://unused"))
+    events = []
+
+    async def fake_publish_sync(exchange_name, routing_key, body):
+        events.append(("start", body))
+        await asyncio.sleep(0)
+        events.append(("end", body))
+        if body == "bad":
+            raise RuntimeError("broker said no")
+
+    client.publish_sync = fake_publish_sync
+    results = await asyncio.gather(
+        client.publish("ex", "rk", "a"),
+        client.publish("ex", "rk", "bad"),
+        client.publish("ex", "rk", b"c"),
+        return_exceptions=True,
+    )
+
+    # all three went out concurrently from a single flush
+    assert events[:3] == [("start", "a"), ("start", "bad"), ("start", b"c")]
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_publish_nowait_is_bounded_and_does_not_raise():
+    client = AsyncSingleThreadMQConsumer(ConnectionConfig(url="amqp://unused"))
+    client.publish_queue_max = 2
+    sent = []
+
+    async def fake_publish_sync(exchange_name, routing_key, body):
+        sent.append(body)
+        if body == "bad":
+            raise RuntimeError("broker said no")
+
+    client.publish_sync = fake_publish_sync
+    assert client.publish_nowait("ex", "rk", "bad")
+    assert client.publish_nowait("ex", "rk", "b")
+    # the flusher has not run yet, so the third one finds the queue full
+    assert not client.publish_nowait("ex", "rk", "c")
+
+    await asyncio.sleep(0.01)
+    assert sent == ["bad", "b"]
+    await client.disconnect()
+
+
+class FakeQueue:
+    async def bind(self, exchange, routing_key):
+        pass
+
+
+class FakeChannel:
+    def __init__(self, calls: list, missing: bool = False):
+        self.calls = calls
+        self.missing = missing
+        self.is_closed = False
+
+    async def set_qos(self, prefetch_count):
+        pass
+
+    async def declare_exchange(self, name, *args, **kwargs):
+        self.calls.append(("declare_exchange", name))
+
+    async def declare_queue(self, name, **kwargs):
+        self.calls.append(("declare_queue", name))
+        return FakeQueue()
+
+    async def get_queue(self, name, ensure=True):
+        self.calls.append(("get_queue", name))
+        if self.missing:
+            self.is_closed = True
+            raise ChannelNotFoundEntity("NOT_FOUND")
+        return FakeQueue()
+
+    async def close(self):
+        self.is_closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.calls = []
+        self.missing = False
+
+    async def channel(self):
+        channel = FakeChannel(self.calls, self.missing)
+        # only the first reopened channel sees the missing queue
+        self.missing = False
+        return channel
+
+
+@pytest.mark.asyncio
+async def test_consumer_topology_is_declared_passively_after_first_setup():
+    client = AsyncSingleThreadMQConsumer(ConnectionConfig(url="amqp://unused"))
+    client.connection = FakeConnection()
+    config = ConsumerConfig(
+        exchange_name="ex",
+        routing_key="rk",
+        queue_name="q",
+        handler=SpecialHandler.NO_PROCESS,
+    )
+
+    await client._open_consumer_channel(config)
+    assert client.connection.calls == [
+        ("declare_exchange", "ex"),
+        ("declare_queue", "q"),
+    ]
+
+    client.connection.calls.clear()
+    await client._open_consumer_channel(config)
+    assert client.connection.calls == [("get_queue", "q")]
+
+    # queue vanished on the broker: fall back to a full declare
+    client.connection.calls.clear()
+    client.connection.missing = True
+    await client._open_consumer_channel(config)
+    assert client.connection.calls == [
+        ("get_queue", "q"),
+        ("declare_exchange", "ex"),
+        ("declare_queue", "q"),
+    ]
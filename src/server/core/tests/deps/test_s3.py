@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import json
 from acontext_core.infra.s3 import S3Client
@@ -26,3 +27,57 @@ async def test_s3():
 
     # await S3_CLIENT.delete_object("foo/ok.json")
     print("Upload successful!")
+
+
+@pytest.mark.asyncio
+async def test_download_fan_out_is_bounded_by_pool_size():
+    S3_CLIENT = S3Client({"max_pool_connections": 2})
+    in_flight = []
+    peak = 0
+
+    class FakeBody:
+        async def read(self):
+            return b"[]"
+
+    class FakeClient:
+        async def get_object(self, Bucket, Key):
+            nonlocal peak
+            in_flight.append(Key)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(Key)
+            return {"Body": FakeBody()}
+
+    S3_CLIENT._client = FakeClient()
+    payloads = await asyncio.gather(
+        *(S3_CLIENT.download_object(f"k{i}") for i in range(6))
+    )
+    assert payloads == [b"[]"] * 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_download_bytearray_fills_preallocated_buffer():
+    S3_CLIENT = S3Client()
+    objects = {"whole": (b'[{"type": "text"}]', 18), "short": (b"[]", 5)}
+
+    class FakeBody:
+        def __init__(self, data):
+            self.data = data
+
+        async def iter_chunks(self, chunk_size=4):
+            for i in range(0, len(self.data), chunk_size):
+                yield self.data[i : i + chunk_size]
+
+    class FakeClient:
+        async def get_object(self, Bucket, Key):
+            data, length = objects[Key]
+            return {"Body": FakeBody(data), "ContentLength": length}
+
+    S3_CLIENT._client = FakeClient()
+    content = await S3_CLIENT.download_object_bytearray("whole")
+    assert isinstance(content, bytearray)
+    assert content == objects["whole"][0]
+
+    with pytest.raises(IOError):
+        await S3_CLIENT.download_object_bytearray("short")
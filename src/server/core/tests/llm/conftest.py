@@ -0,0 +1,51 @@
+"""
+Shared test fixtures for LLM tests.
+"""
+
+import pytest
+from openai.types.chat import ChatCompletionChunk
+from pydantic import BaseModel
+
+from acontext_core.schema.llm import LLMResponse
+
+
+class _Raw(BaseModel):
+    pass
+
+
+@pytest.fixture
+def make_llm_response():
+    """
+    Build an assistant LLMResponse with a stub raw_response.
+
+    Usage:
+        def test_x(make_llm_response):
+            response = make_llm_response(content="hi")
+    """
+
+    def make(**fields) -> LLMResponse:
+        return LLMResponse(
+            **{"role": "assistant", "raw_response": _Raw(), **fields}
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_chunk():
+    """Build an openai ChatCompletionChunk carrying a single choice delta"""
+
+    def make(delta: dict, finish_reason=None) -> ChatCompletionChunk:
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "test-model",
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+        )
+
+    return make
@@ -0,0 +1,56 @@
+import pytest
+
+from acontext_core.llm import complete as C
+from acontext_core.llm.complete.cache import LLMResponseCache
+
+
+def test_cache_evicts_least_recently_used(make_llm_response):
+    cache = LLMResponseCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", make_llm_response(content="a"))
+    cache.set("b", make_llm_response(content="b"))
+    assert cache.get("a").content == "a"
+    cache.set("c", make_llm_response(content="c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").content == "a"
+    assert cache.get("c").content == "c"
+
+
+def test_cache_entries_expire(make_llm_response):
+    cache = LLMResponseCache(maxsize=2, ttl_seconds=-1)
+    cache.set("a", make_llm_response(content="a"))
+    assert cache.get("a") is None
+
+
+def test_cache_key_is_order_independent():
+    k1 = LLMResponseCache.make_key(model="m", kwargs={"a": 1, "b": 2})
+    k2 = LLMResponseCache.make_key(kwargs={"b": 2, "a": 1}, model="m")
+    assert k1 == k2
+    assert k1 != LLMResponseCache.make_key(model="m", kwargs={"a": 1, "b": 3})
+
+
+def test_cache_key_skips_unserializable_requests():
+    # a repr with an address would make every key unique
+    assert LLMResponseCache.make_key(model="m", kwargs={"client": object()}) is None
+
+
+@pytest.mark.asyncio
+async def test_llm_complete_caches_only_zero_temperature(monkeypatch, make_llm_response):
+    calls = []
+
+    async def fake_complete(prompt, **kwargs):
+        calls.append(prompt)
+        return make_llm_response(content=prompt)
+
+    monkeypatch.setitem(C.FACTORIES, C.DEFAULT_CORE_CONFIG.llm_sdk, fake_complete)
+    C.RESPONSE_CACHE.clear()
+
+    for _ in range(2):
+        r = await C.llm_complete("hi", temperature=0)
+        assert r.unpack()[0].content == "hi"
+    assert calls == ["hi"]
+
+    for _ in range(2):
+        await C.llm_complete("hi", temperature=0.7)
+    assert calls == ["hi", "hi", "hi"]
+    C.RESPONSE_CACHE.clear()
@@ -0,0 +1,53 @@
+from acontext_core.llm.complete.anthropic_sdk import with_cache_breakpoint
+from acontext_core.llm.complete import openai_sdk
+from acontext_core.llm.complete.openai_sdk import (
+    accepts_prompt_cache_key,
+    prompt_cache_key,
+)
+
+
+def test_cache_breakpoint_tags_last_block_without_mutating():
+    message = {"role": "user", "content": "task input"}
+    tagged = with_cache_breakpoint(message)
+    assert message == {"role": "user", "content": "task input"}
+    assert tagged["content"] == [
+        {
+            "type": "text",
+            "text": "task input",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+
+    blocks = [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]
+    tagged = with_cache_breakpoint({"role": "user", "content": blocks})
+    assert "cache_control" not in blocks[-1]
+    assert "cache_control" not in tagged["content"][0]
+    assert tagged["content"][1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_prompt_cache_key_depends_on_prefix_only():
+    tools = [{"type": "function", "function": {"name": "finish"}}]
+    key = prompt_cache_key("system", tools)
+    assert len(key) == 32
+    assert key == prompt_cache_key("system", list(tools))
+    assert key != prompt_cache_key("system", None)
+    assert key != prompt_cache_key("other system", tools)
+
+
+def test_tools_are_encoded_once_per_list(monkeypatch):
+    tools = [{"type": "function", "function": {"name": "report_thinking"}}]
+    key = prompt_cache_key("system", tools)
+
+    def fail_dumps(*args, **kwargs):
+        raise AssertionError("tools were encoded again")
+
+    monkeypatch.setattr(openai_sdk.orjson, "dumps", fail_dumps)
+    assert prompt_cache_key("system", tools) == key
+    assert prompt_cache_key("other system", tools) != key
+
+
+def test_prompt_cache_key_is_only_sent_to_the_openai_api():
+    assert accepts_prompt_cache_key(None)
+    assert accepts_prompt_cache_key("https://api.openai.com/v1")
+    assert not accepts_prompt_cache_key("http://localhost:8000/v1")
+    assert not accepts_prompt_cache_key("https://openrouter.ai/api/v1")
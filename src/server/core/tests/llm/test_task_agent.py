@@ -0,0 +1,376 @@
+"""
+Tests for the task agent's tool dispatch
+"""
+
+import asyncio
+import pytest
+
+from acontext_core.infra.db import DatabaseClient
+from acontext_core.llm.agent import task as T
+from acontext_core.llm.tool.task_lib import ctx as ctx_module
+from acontext_core.llm.tool.task_lib.ctx import TaskCtx
+from acontext_core.llm.tool.task_lib.args import TaskOrderArg, MessageIdsArg
+from acontext_core.llm.prompt.task import TaskPrompt
+from acontext_core.llm.prompt.task_sop import TaskSOPPrompt
+from acontext_core.llm.agent.task import SERIAL_TOOLS, NEED_UPDATE_CTX, _run_tool
+from acontext_core.schema.llm import LLMFunction, LLMToolCall
+from acontext_core.schema.orm import Project, Space, Session
+from acontext_core.schema.result import Result
+from acontext_core.service.data.task import fetch_current_tasks
+
+
+def _tool_call(name: str, arguments: dict) -> LLMToolCall:
+    return LLMToolCall(
+        id=f"call_{name}",
+        type="function",
+        function=LLMFunction(name=name, arguments=arguments),
+    )
+
+
+def test_db_writing_tools_are_serialized():
+    assert NEED_UPDATE_CTX <= SERIAL_TOOLS
+    assert "append_messages_to_planning_section" in SERIAL_TOOLS
+    assert "report_thinking" not in SERIAL_TOOLS
+
+
+def test_json_tools_are_dumped_once_per_prompt():
+    tools = TaskPrompt.json_tools()
+    assert tools is TaskPrompt.json_tools()
+    assert [t["function"]["name"] for t in tools] == [
+        t.function.name for t in TaskPrompt.tool_schema()
+    ]
+    assert TaskSOPPrompt.json_tools() is not tools
+
+
+def test_queued_appends_keep_the_last_task_of_a_message():
+    ctx = TaskCtx(None, None, None, [], [], [])
+    ctx.queue_append("t1", ["m1", "m2"])
+    ctx.queue_append("t2", ["m2", "m3"])
+    ctx.queue_append("t1", ["m4"])
+    assert ctx.pending_appends == {"t1": ["m1", "m4"], "t2": ["m2", "m3"]}
+
+
+@pytest.mark.asyncio
+async def test_append_progress_waits_for_the_link_batch(monkeypatch):
+    from acontext_core.llm.tool.task_lib.append import (
+        _append_messages_to_task_handler,
+    )
+    from acontext_core.schema.session.task import TaskStatus
+
+    writes = []
+
+    async def failing_links(db_session, task_messages):
+        return Result.reject("links failed")
+
+    def record(name):
+        async def write(db_session, task_id, *args, **kwargs):
+            writes.append(name)
+            return Result.resolve(None)
+
+        return write
+
+    monkeypatch.setattr(ctx_module.TD, "append_messages_to_tasks", failing_links)
+    monkeypatch.setattr(ctx_module.TD, "append_progress_to_task", record("progress"))
+    monkeypatch.setattr(ctx_module.TD, "update_task", record("status"))
+
+    class _Task:
+        status = TaskStatus.PENDING
+
+    ctx = TaskCtx(None, None, None, ["t1"], [_Task()], ["m0"])
+    r = await _append_messages_to_task_handler(
+        ctx, {"task_order": 1, "progress": "did it", "message_ids": [0]}
+    )
+    assert r.ok()
+    assert writes == []
+    assert ctx.pending_progresses == [("t1", "did it", None)]
+    assert ctx.pending_running == ["t1"]
+
+    assert not (await ctx.flush()).ok()
+    assert writes == []
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_batch_is_not_counted(monkeypatch):
+    increments = []
+
+    async def failing_inserts(*args):
+        return Result.reject("insert failed")
+
+    async def count_metrics(**kwargs):
+        increments.append(kwargs["increment"])
+
+    monkeypatch.setattr(ctx_module.TD, "insert_tasks", failing_inserts)
+    monkeypatch.setattr(ctx_module, "capture_increment", count_metrics)
+    ctx = TaskCtx(None, None, None, [], [], [])
+    ctx.pending_inserts.append((0, {"task_description": "a"}))
+
+    assert not (await ctx.flush()).ok()
+    await asyncio.sleep(0)
+    assert increments == []
+
+
+@pytest.mark.asyncio
+async def test_failed_link_write_keeps_the_queued_insert(monkeypatch):
+    increments = []
+    inserted = []
+    links_fail = [True]
+
+    async def insert_tasks(db_session, project_id, session_id, inserts):
+        inserted.append(list(inserts))
+        return Result.resolve([])
+
+    async def append_links(db_session, task_messages):
+        if links_fail[0]:
+            return Result.reject("links failed")
+        return Result.resolve(None)
+
+    async def count_metrics(**kwargs):
+        increments.append(kwargs["increment"])
+
+    monkeypatch.setattr(ctx_module.TD, "insert_tasks", insert_tasks)
+    monkeypatch.setattr(ctx_module.TD, "append_messages_to_tasks", append_links)
+    monkeypatch.setattr(ctx_module, "capture_increment", count_metrics)
+    ctx = TaskCtx(None, None, None, ["t1"], ["task1"], ["m0"])
+    ctx.pending_inserts.append((0, {"task_description": "a"}))
+    ctx.queue_append("t1", ["m0"])
+
+    # the caller rolls the insert back with the failed links, so it stays queued
+    assert not (await ctx.flush()).ok()
+    await asyncio.sleep(0)
+    assert ctx.pending_inserts == [(0, {"task_description": "a"})]
+    assert ctx.pending_appends == {"t1": ["m0"]}
+    assert increments == []
+
+    links_fail[0] = False
+    assert (await ctx.flush()).ok()
+    await asyncio.sleep(0)
+    assert len(inserted) == 2
+    assert ctx.pending_inserts == [] and ctx.pending_appends == {}
+    assert increments == [1]
+
+
+def test_ctx_lookups_by_order():
+    ctx = TaskCtx(None, None, None, ["t1", "t2"], ["task1", "task2"], ["m0", "m1"])
+    assert ctx.task_id_by_order.get(1) == "t1"
+    assert ctx.task_by_order.get(2) == "task2"
+    assert ctx.task_id_by_order.get(0) is None
+    assert ctx.message_id_by_order.get(0) == "m0"
+    # negative indexes no longer wrap around to the last messages
+    assert ctx.message_id_by_order.get(-1) is None
+
+
+def test_tool_argument_parsing():
+    ctx = TaskCtx(None, None, None, ["t1"], ["task1"], ["m0", "m1"])
+    task = TaskOrderArg.parse(ctx, {"task_order": 1}, "updating")
+    assert (task.order, task.task_id, task.task) == (1, "t1", "task1")
+    missing = TaskOrderArg.parse(ctx, {}, "updating")
+    assert missing is TaskOrderArg.parse(ctx, {"task_order": 0}, "updating")
+    assert "Updating failed" in missing.data
+    out_of_range = TaskOrderArg.parse(ctx, {"task_order": 2}, "appending")
+    assert out_of_range.data == "Task order 2 is out of range, appending failed."
+    assert out_of_range is TaskOrderArg.parse(ctx, {"task_order": 2}, "appending")
+
+    messages = MessageIdsArg.parse(ctx, {"message_ids": [1, 5]})
+    assert (messages.indexes, messages.message_ids) == ([1, 5], ["m1"])
+    skipped = MessageIdsArg.parse(ctx, {"message_ids": [5]})
+    assert skipped.data == "No message ids to append, skip: [5]"
+
+
+@pytest.mark.asyncio
+async def test_bogus_message_ids_are_answered_without_a_session():
+    ctx = TaskCtx(None, None, None, ["t1"], ["task1"], ["m0"])
+    runner = T.TurnToolRunner(None, None, [], ctx)
+    tc = _tool_call("append_messages_to_planning_section", {"message_ids": [7]})
+    runner.submit(tc)
+    assert runner._serial_calls == []
+
+    r = await runner.wait(Result.resolve(None))
+    assert r.unpack()[0] == [
+        {
+            "role": "tool",
+            "tool_call_id": tc.id,
+            "content": "No message ids to append, skip: [7]",
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tools_without_a_session_skip_the_db(monkeypatch):
+    class NoDB:
+        def get_session_context(self):
+            raise AssertionError("report_thinking must not check out a session")
+
+    async def no_ctx(*args, **kwargs):
+        raise AssertionError("report_thinking must not rebuild the ctx")
+
+    monkeypatch.setattr(T, "DB_CLIENT", NoDB())
+    monkeypatch.setattr(T, "build_task_ctx", no_ctx)
+    runner = T.TurnToolRunner(None, None, [], None)
+    runner.submit(_tool_call("report_thinking", {"thinking": "hmm"}))
+
+    r = await runner.wait(Result.resolve(None))
+    assert [m["content"] for m in r.unpack()[0]] == ["thinking reported"]
+
+
+@pytest.mark.asyncio
+async def test_db_tools_wait_for_the_complete_response(monkeypatch):
+    sessions = []
+
+    class RecordingDB:
+        def get_session_context(self):
+            sessions.append(True)
+            raise AssertionError("no session while the response streams")
+
+    monkeypatch.setattr(T, "DB_CLIENT", RecordingDB())
+    runner = T.TurnToolRunner(None, None, [], None)
+    runner.submit(
+        _tool_call("insert_task", {"after_task_order": 0, "task_description": "a"})
+    )
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert sessions == []
+
+    r = await runner.wait(Result.reject("stream dropped"))
+    assert r.ok()
+    assert sessions == []
+
+
+@pytest.mark.asyncio
+async def test_run_tool_returns_tool_message():
+    r = await _run_tool(_tool_call("report_thinking", {"thinking": "hmm"}), None)
+    assert r.unpack()[0] == {
+        "role": "tool",
+        "tool_call_id": "call_report_thinking",
+        "content": "thinking reported",
+    }
+
+
+@pytest.mark.asyncio
+async def test_run_tool_rejects_unknown_tool():
+    r = await _run_tool(_tool_call("no_such_tool", {}), None)
+    _, eil = r.unpack()
+    assert eil
+    assert "not found" in str(eil)
+
+
+@pytest.mark.asyncio
+async def test_run_tool_reports_handler_key_errors_as_tool_errors():
+    # a missing argument is not a missing tool
+    r = await _run_tool(_tool_call("insert_task", {"task_description": "a"}), None)
+    _, eil = r.unpack()
+    assert "insert_task error" in str(eil)
+
+
+@pytest.mark.asyncio
+async def test_task_agent_refreshes_ctx_between_mutating_tools(
+    monkeypatch, make_llm_response
+):
+    db_client = DatabaseClient()
+    await db_client.create_tables()
+    monkeypatch.setattr(T, "DB_CLIENT", db_client)
+
+    async with db_client.get_session_context() as session:
+        project = Project(
+            secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+        )
+        session.add(project)
+        await session.flush()
+        space = Space(project_id=project.id)
+        session.add(space)
+        await session.flush()
+        test_session = Session(project_id=project.id, space_id=space.id)
+        session.add(test_session)
+        await session.flush()
+        project_id, session_id = project.id, test_session.id
+
+    # one turn: think, insert two tasks, then update the second one, which
+    # only exists in the ctx after the refresh
+    turn = [
+        _tool_call("report_thinking", {"thinking": "two tasks"}),
+        _tool_call("insert_task", {"after_task_order": 0, "task_description": "a"}),
+        _tool_call("insert_task", {"after_task_order": 1, "task_description": "b"}),
+        _tool_call("update_task", {"task_order": 2, "task_status": "running"}),
+        _tool_call("finish", {}),
+    ]
+    for i, tc in enumerate(turn):
+        tc.id = f"call_{i}"
+
+    async def fake_llm_complete(on_tool_call=None, **kwargs):
+        for tc in turn:
+            on_tool_call(tc)
+        return Result.resolve(make_llm_response(tool_calls=turn))
+
+    increments = []
+
+    async def count_metrics(**kwargs):
+        increments.append(kwargs["increment"])
+
+    monkeypatch.setattr(T, "llm_complete", fake_llm_complete)
+    monkeypatch.setattr(ctx_module, "capture_increment", count_metrics)
+    monkeypatch.setattr(T, "response_to_sendable_message", lambda m: {"role": m.role})
+
+    try:
+        r = await T.task_agent_curd(project_id, session_id, [])
+        assert r.ok()
+        await asyncio.sleep(0)
+        # both inserts went out in one batch and are counted once it's written
+        assert increments == [2]
+
+        async with db_client.get_session_context() as session:
+            tasks, _ = (await fetch_current_tasks(session, session_id)).unpack()
+        assert [
+            (t.order, t.data.task_description, t.status.value) for t in tasks
+        ] == [
+            (1, "a", "pending"),
+            (2, "b", "running"),
+        ]
+    finally:
+        async with db_client.get_session_context() as session:
+            await session.delete(await session.get(Project, project_id))
+
+
+@pytest.mark.asyncio
+async def test_task_agent_skips_db_tools_of_a_broken_stream(monkeypatch):
+    db_client = DatabaseClient()
+    await db_client.create_tables()
+    monkeypatch.setattr(T, "DB_CLIENT", db_client)
+
+    async with db_client.get_session_context() as session:
+        project = Project(
+            secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+        )
+        session.add(project)
+        await session.flush()
+        space = Space(project_id=project.id)
+        session.add(space)
+        await session.flush()
+        test_session = Session(project_id=project.id, space_id=space.id)
+        session.add(test_session)
+        await session.flush()
+        project_id, session_id = project.id, test_session.id
+
+    async def broken_llm_complete(on_tool_call=None, **kwargs):
+        on_tool_call(
+            _tool_call("insert_task", {"after_task_order": 0, "task_description": "a"})
+        )
+        # the insert arrives while the stream is still going, then the stream drops
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return Result.reject("stream dropped")
+
+    async def no_metrics(**kwargs):
+        pass
+
+    monkeypatch.setattr(T, "llm_complete", broken_llm_complete)
+    monkeypatch.setattr(ctx_module, "capture_increment", no_metrics)
+
+    try:
+        r = await T.task_agent_curd(project_id, session_id, [])
+        assert "stream dropped" in str(r.unpack()[1])
+
+        async with db_client.get_session_context() as session:
+            tasks, _ = (await fetch_current_tasks(session, session_id)).unpack()
+        assert tasks == []
+    finally:
+        async with db_client.get_session_context() as session:
+            await session.delete(await session.get(Project, project_id))
@@ -0,0 +1,98 @@
+import pytest
+
+from acontext_core.llm import complete as C
+from acontext_core.llm.complete.openai_sdk import stream_completion
+
+
+def _tool_delta(index: int, **function) -> dict:
+    tool_call = {"index": index, "function": function}
+    if "name" in function:
+        tool_call.update(id=f"call_{index}", type="function")
+    return {"tool_calls": [tool_call]}
+
+
+class FakeStream:
+    def __init__(self, chunks, seen: list):
+        self.chunks = chunks
+        self.seen = seen
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for i, chunk in enumerate(self.chunks):
+            self.seen.append(("chunk", i))
+            yield chunk
+
+
+class FakeCompletions:
+    def __init__(self, stream):
+        self.stream = stream
+        self.kwargs = None
+
+    async def create(self, **kwargs):
+        self.kwargs = kwargs
+        return self.stream
+
+
+class FakeClient:
+    def __init__(self, stream):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = FakeCompletions(stream)
+
+
+@pytest.mark.asyncio
+async def test_stream_completion_hands_out_tool_calls_early(make_chunk):
+    seen = []
+    chunks = [
+        make_chunk({"role": "assistant", **_tool_delta(0, name="a", arguments='{"x"')}),
+        make_chunk(_tool_delta(0, arguments=": 1}")),
+        make_chunk(_tool_delta(1, name="b", arguments="{}")),
+        make_chunk({}, finish_reason="tool_calls"),
+    ]
+    client = FakeClient(FakeStream(chunks, seen))
+
+    completion = await stream_completion(
+        client,
+        lambda tc: seen.append(("tool", tc.function.name, tc.function.arguments)),
+        tools=[],
+        model="test-model",
+        messages=[],
+    )
+
+    # "a" is handed out as soon as "b" starts, before the stream ends
+    assert seen == [
+        ("chunk", 0),
+        ("chunk", 1),
+        ("chunk", 2),
+        ("tool", "a", {"x": 1}),
+        ("chunk", 3),
+        ("tool", "b", {}),
+    ]
+    assert client.chat.completions.kwargs["stream"] is True
+    message = completion.choices[0].message
+    assert [tc.id for tc in message.tool_calls] == ["call_0", "call_1"]
+
+
+@pytest.mark.asyncio
+async def test_llm_complete_reports_tool_calls_without_streaming(
+    monkeypatch, make_llm_response
+):
+    async def fake_complete(prompt, **kwargs):
+        assert "on_tool_call" not in kwargs
+        return make_llm_response(
+            tool_calls=[
+                {"id": "c1", "type": "function", "function": {"name": "a", "arguments": {}}},
+                {"id": "c2", "type": "function", "function": {"name": "b", "arguments": {}}},
+            ],
+        )
+
+    monkeypatch.setattr(C.DEFAULT_CORE_CONFIG, "llm_stream_tool_calls", False)
+    monkeypatch.setitem(C.FACTORIES, C.DEFAULT_CORE_CONFIG.llm_sdk, fake_complete)
+    seen = []
+    r = await C.llm_complete("hi", tools=[{}], on_tool_call=seen.append)
+    assert r.ok()
+    assert [tc.id for tc in seen] == ["c1", "c2"]
@@ -0,0 +1,12 @@
+import time
+from acontext_core.schema.utils import uuid7
+
+
+def test_uuid7_is_versioned_and_time_ordered():
+    ids = []
+    for _ in range(3):
+        ids.append(uuid7())
+        time.sleep(0.002)
+    assert all(u.version == 7 and u.variant == "specified in RFC 4122" for u in ids)
+    assert ids == sorted(ids)
+    assert abs((ids[0].int >> 80) - time.time_ns() // 1_000_000) < 1000
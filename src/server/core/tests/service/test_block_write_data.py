@@ -320,6 +320,62 @@ class TestSOPBlock:
 
             await session.delete(project)
 
+    @pytest.mark.asyncio
+    async def test_write_sop_repeated_tool_shares_reference(self):
+        """Test that a tool used twice in one SOP gets a single ToolReference"""
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+            )
+            session.add(project)
+            await session.flush()
+
+            space = Space(project_id=project.id)
+            session.add(space)
+            await session.flush()
+
+            r = await create_new_path_block(session, space.id, "Parent Page")
+            assert r.ok()
+            parent_id = r.data.id
+
+            sop_data = SOPData(
+                use_when="Repeated tool test",
+                preferences="",
+                tool_sops=[
+                    SOPStep(tool_name="search", action="look up the docs"),
+                    SOPStep(tool_name="write", action="write the answer"),
+                    SOPStep(tool_name=" Search ", action="double check"),
+                ],
+            )
+
+            r = await write_sop_block_to_parent(session, space.id, parent_id, sop_data)
+            assert r.ok()
+            sop_block_id = r.data
+
+            query = select(ToolReference.name, ToolReference.id).where(
+                ToolReference.project_id == project.id
+            )
+            result = await session.execute(query)
+            ref_ids = dict(result.all())
+            assert set(ref_ids) == {"search", "write"}
+
+            query = (
+                select(ToolSOP.tool_reference_id)
+                .where(ToolSOP.sop_block_id == sop_block_id)
+                .order_by(ToolSOP.order)
+            )
+            result = await session.execute(query)
+            assert result.scalars().all() == [
+                ref_ids["search"],
+                ref_ids["write"],
+                ref_ids["search"],
+            ]
+
+            await session.delete(project)
+
     @pytest.mark.asyncio
     async def test_write_sop_multiple_with_sort(self):
         """Test creating multiple SOPs under same parent with correct sort order"""
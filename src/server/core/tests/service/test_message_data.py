@@ -0,0 +1,314 @@
+import asyncio
+import uuid
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from acontext_core.service.data import message as MD
+from acontext_core.schema.orm import Project, Space, Session, Message, Part
+from acontext_core.schema.result import Result
+from acontext_core.schema.session.task import TaskStatus
+from acontext_core.infra.db import DatabaseClient
+
+
+class TestFetchMessageBlobsByIds:
+    @pytest.mark.asyncio
+    async def test_blobs_follow_id_order_and_fail_on_broken_parts(
+        self, monkeypatch
+    ):
+        async def fake_fetch_parts(parts_asset_meta):
+            if parts_asset_meta.get("broken"):
+                return Result.reject("s3 said no")
+            return Result.resolve([Part(type="text", text=parts_asset_meta["text"])])
+
+        monkeypatch.setattr(MD, "_fetch_message_parts", fake_fetch_parts)
+
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+            )
+            session.add(project)
+            await session.flush()
+
+            space = Space(project_id=project.id)
+            session.add(space)
+            await session.flush()
+
+            test_session = Session(project_id=project.id, space_id=space.id)
+            session.add(test_session)
+            await session.flush()
+
+            messages = [
+                Message(
+                    session_id=test_session.id,
+                    role=role,
+                    parts_asset_meta={"text": text},
+                )
+                for role, text in [("user", "hi"), ("assistant", "hello")]
+            ]
+            broken = Message(
+                session_id=test_session.id,
+                role="user",
+                parts_asset_meta={"broken": True},
+            )
+            session.add_all(messages + [broken])
+            await session.flush()
+
+            ids = [messages[1].id, messages[0].id]
+            blobs, eil = (await MD.fetch_message_blobs_by_ids(session, ids)).unpack()
+            assert eil is None
+            assert [b.message_id for b in blobs] == ids
+            assert [b.role for b in blobs] == ["assistant", "user"]
+            assert blobs[0].parts[0].text == "hello"
+            assert blobs[0].task_id is None
+
+            r = await MD.fetch_message_blobs_by_ids(session, ids + [broken.id])
+            assert not r.ok()
+
+            await session.delete(project)
+
+
+class TestUnpendingSessionMessagesToRunning:
+    @pytest.mark.asyncio
+    async def test_claims_oldest_pending_in_order(self):
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+            )
+            session.add(project)
+            await session.flush()
+
+            space = Space(project_id=project.id)
+            session.add(space)
+            await session.flush()
+
+            test_session = Session(project_id=project.id, space_id=space.id)
+            session.add(test_session)
+            await session.flush()
+
+            base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            messages = [
+                Message(session_id=test_session.id, role="user", parts_asset_meta={})
+                for _ in range(3)
+            ]
+            for i, m in enumerate(messages):
+                m.created_at = base + timedelta(seconds=i)
+            done = Message(
+                session_id=test_session.id,
+                role="user",
+                parts_asset_meta={},
+                session_task_process_status="success",
+            )
+            done.created_at = base - timedelta(seconds=1)
+            # insert newest first so the claim order can't come from insertion order
+            session.add_all(messages[::-1] + [done])
+            await session.flush()
+
+            r = await MD.unpending_session_messages_to_running(
+                session, test_session.id, limit=2
+            )
+            assert [row.id for row in r.unpack()[0]] == [messages[0].id, messages[1].id]
+
+            r = await MD.unpending_session_messages_to_running(
+                session, test_session.id, limit=2
+            )
+            claimed = r.unpack()[0]
+            assert [row.id for row in claimed] == [messages[2].id]
+            assert claimed[0].role == "user" and claimed[0].parts_asset_meta == {}
+
+            statuses = await session.execute(
+                select(Message.session_task_process_status).where(
+                    Message.session_id == test_session.id
+                )
+            )
+            assert sorted(statuses.scalars().all()) == ["running"] * 3 + ["success"]
+
+            await session.delete(project)
+
+
+class TestFetchMessageChildren:
+    @pytest.mark.asyncio
+    async def test_children_and_db_cascade(self):
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+            )
+            session.add(project)
+            await session.flush()
+
+            space = Space(project_id=project.id)
+            session.add(space)
+            await session.flush()
+
+            test_session = Session(project_id=project.id, space_id=space.id)
+            session.add(test_session)
+            await session.flush()
+
+            parent = Message(
+                session_id=test_session.id, role="user", parts_asset_meta={}
+            )
+            session.add(parent)
+            await session.flush()
+            child = Message(
+                session_id=test_session.id,
+                role="assistant",
+                parts_asset_meta={},
+                parent_id=parent.id,
+            )
+            session.add(child)
+            await session.flush()
+
+            children, _ = (await MD.fetch_message_children(session, parent.id)).unpack()
+            assert [c.id for c in children] == [child.id]
+
+            # deleting the parent still removes the child through the FK
+            await session.delete(parent)
+            await session.flush()
+            session.expunge(child)
+            left = await session.execute(select(Message.id).where(Message.id == child.id))
+            assert left.first() is None
+
+            await session.delete(project)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+
+class TestFetchMessageParts:
+    @pytest.fixture(autouse=True)
+    def fake_redis(self, monkeypatch):
+        redis = FakeRedis()
+
+        @asynccontextmanager
+        async def get_client_context():
+            yield redis
+
+        monkeypatch.setattr(MD.REDIS_CLIENT, "get_client_context", get_client_context)
+        return redis
+
+    @pytest.mark.asyncio
+    async def test_parts_are_decoded_from_downloaded_bytes(self, monkeypatch):
+        payloads = {
+            "ok": b'[{"type": "text", "text": "hi"}]',
+            "not-a-list": b'{"type": "text"}',
+        }
+
+        async def fake_download(key):
+            return payloads[key]
+
+        monkeypatch.setattr(MD.S3_CLIENT, "download_object_bytearray", fake_download)
+        meta = dict(bucket="b", etag="e", sha256="s", mime="application/json", size_b=1)
+
+        parts, eil = (await MD._fetch_message_parts({**meta, "s3_key": "ok"})).unpack()
+        assert eil is None
+        assert parts == [Part(type="text", text="hi")]
+
+        r = await MD._fetch_message_parts({**meta, "s3_key": "not-a-list"})
+        assert not r.ok()
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_downloaded_once(self, monkeypatch):
+        downloads = []
+
+        async def fake_download(key):
+            downloads.append(key)
+            await asyncio.sleep(0)
+            if key.startswith("flaky") and downloads.count(key) == 1:
+                raise RuntimeError("connection reset")
+            return b'[{"type": "text", "text": "shared"}]'
+
+        monkeypatch.setattr(MD.S3_CLIENT, "download_object_bytearray", fake_download)
+        meta = dict(bucket="b", etag="e", sha256="s", mime="application/json", size_b=1)
+        shared = {**meta, "s3_key": f"shared-{uuid.uuid4()}"}
+
+        results = await asyncio.gather(*(MD._fetch_message_parts(shared) for _ in range(3)))
+        assert all(r.ok() for r in results)
+        assert (await MD._fetch_message_parts(shared)).ok()
+        assert downloads == [shared["s3_key"]]
+
+        # failures aren't cached, the next call tries again
+        flaky = {**meta, "s3_key": f"flaky-{uuid.uuid4()}"}
+        assert not (await MD._fetch_message_parts(flaky)).ok()
+        assert (await MD._fetch_message_parts(flaky)).ok()
+        assert downloads.count(flaky["s3_key"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_parts_cached_by_the_api_skip_s3(self, monkeypatch, fake_redis):
+        async def fail_download(key):
+            raise AssertionError("cached parts must not hit S3")
+
+        monkeypatch.setattr(MD.S3_CLIENT, "download_object_bytearray", fail_download)
+        sha = uuid.uuid4().hex
+        fake_redis.data[f"message:parts:{sha}"] = '[{"type": "text", "text": "cached"}]'
+        meta = dict(bucket="b", etag="e", mime="application/json", size_b=1)
+
+        parts, eil = (
+            await MD._fetch_message_parts(
+                {**meta, "sha256": sha, "s3_key": f"parts/{sha}.json"}
+            )
+        ).unpack()
+        assert eil is None
+        assert parts == [Part(type="text", text="cached")]
+
+
+class TestUpdateMessageStatusTo:
+    @pytest.mark.asyncio
+    async def test_updates_only_given_ids(self):
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+            )
+            session.add(project)
+            await session.flush()
+
+            space = Space(project_id=project.id)
+            session.add(space)
+            await session.flush()
+
+            test_session = Session(project_id=project.id, space_id=space.id)
+            session.add(test_session)
+            await session.flush()
+
+            messages = [
+                Message(session_id=test_session.id, role="user", parts_asset_meta={})
+                for _ in range(3)
+            ]
+            session.add_all(messages)
+            await session.flush()
+
+            r = await MD.update_message_status_to(
+                session, [messages[0].id, messages[2].id], TaskStatus.FAILED
+            )
+            assert r.ok()
+            # empty id lists are a no-op rather than an error
+            assert (await MD.update_message_status_to(session, [], TaskStatus.FAILED)).ok()
+
+            statuses = await session.execute(
+                select(Message.id, Message.session_task_process_status).where(
+                    Message.session_id == test_session.id
+                )
+            )
+            assert dict(statuses.all()) == {
+                messages[0].id: "failed",
+                messages[1].id: "pending",
+                messages[2].id: "failed",
+            }
+
+            await session.delete(project)
@@ -1,15 +1,20 @@
 import pytest
 import uuid
+from datetime import datetime, timedelta, timezone
 from sqlalchemy import select, func
 from acontext_core.service.data.task import (
     fetch_current_tasks,
+    fetch_task,
+    fetch_planning_task,
     update_task,
     insert_task,
+    insert_tasks,
     delete_task,
     append_progress_to_task,
     append_sop_thinking_to_task,
+    append_messages_to_tasks,
 )
-from acontext_core.schema.orm import Task, Project, Space, Session
+from acontext_core.schema.orm import Task, Project, Space, Session, Message
 from acontext_core.schema.result import Result
 from acontext_core.infra.db import DatabaseClient
 
@@ -796,6 +801,68 @@ class TestInsertTask:
             await session.delete(project)
 
 
+    @pytest.mark.asyncio
+    async def test_insert_tasks_matches_sequential_inserts(self):
+        """Test that a batch of inserts orders tasks like one insert_task per item"""
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac_batch_insert",
+                secret_key_hash_phc="test_key_hash_batch_insert",
+            )
+            session.add(project)
+            await session.flush()
+
+            sessions = []
+            for _ in range(2):
+                test_session = Session(project_id=project.id)
+                session.add(test_session)
+                await session.flush()
+                session.add_all(
+                    [
+                        Task(
+                            session_id=test_session.id,
+                            project_id=project.id,
+                            order=i,
+                            data={"task_description": f"Task {i}"},
+                        )
+                        for i in (1, 2, 3)
+                    ]
+                )
+                await session.flush()
+                sessions.append(test_session.id)
+
+            inserts = [
+                (1, {"task_description": "a"}),
+                (0, {"task_description": "b"}),
+                (5, {"task_description": "c"}),
+                (3, {"task_description": "d"}),
+            ]
+            for after_order, data in inserts:
+                r = await insert_task(
+                    session, project.id, sessions[0], after_order, dict(data)
+                )
+                assert r.ok()
+            result = await insert_tasks(session, project.id, sessions[1], inserts)
+            new_tasks, error = result.unpack()
+            assert error is None
+            # final orders, after the later inserts shifted them
+            assert [t.order for t in new_tasks] == [3, 1, 7, 4]
+
+            layouts = []
+            for session_id in sessions:
+                tasks, _ = (await fetch_current_tasks(session, session_id)).unpack()
+                layouts.append(
+                    [(t.order, t.data.task_description) for t in tasks]
+                )
+            assert layouts[0] == layouts[1]
+            assert [order for order, _ in layouts[1]] == list(range(1, 8))
+
+            await session.delete(project)
+
+
 class TestDeleteTask:
     @pytest.mark.asyncio
     async def test_delete_task_success(self):
@@ -1146,6 +1213,64 @@ class TestIntegrationScenarios:
             await session.delete(project)
 
 
+class TestAppendMessagesToTasks:
+    @pytest.mark.asyncio
+    async def test_append_messages_to_many_tasks(self):
+        """Test linking messages of several tasks in one batch"""
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac_batch_append",
+                secret_key_hash_phc="test_key_hash_batch_append",
+            )
+            session.add(project)
+            await session.flush()
+
+            test_session = Session(project_id=project.id)
+            session.add(test_session)
+            await session.flush()
+
+            tasks = [
+                Task(
+                    session_id=test_session.id,
+                    project_id=project.id,
+                    order=i,
+                    data={"task_description": f"Task {i}"},
+                )
+                for i in (1, 2)
+            ]
+            messages = [
+                Message(session_id=test_session.id, role="user", parts_asset_meta={})
+                for _ in range(3)
+            ]
+            session.add_all(tasks + messages)
+            await session.flush()
+
+            result = await append_messages_to_tasks(
+                session,
+                {
+                    tasks[0].id: [messages[0].id, messages[1].id],
+                    tasks[1].id: [messages[2].id],
+                },
+            )
+            assert result.ok()
+
+            for m in messages:
+                await session.refresh(m)
+            assert [m.task_id for m in messages] == [
+                tasks[0].id,
+                tasks[0].id,
+                tasks[1].id,
+            ]
+
+            # nothing queued is a no-op
+            assert (await append_messages_to_tasks(session, {})).ok()
+
+            await session.delete(project)
+
+
 class TestAppendProgressToTask:
     @pytest.mark.asyncio
     async def test_append_progress_to_null_progresses(self):
@@ -1620,3 +1745,76 @@ class TestAppendSopThinkingToTask:
             assert task.data["status_info"] == initial_data["status_info"]
 
             await session.delete(project)
+
+
+class TestTaskRawMessageIds:
+    @pytest.mark.asyncio
+    async def test_message_ids_are_in_creation_order(self):
+        db_client = DatabaseClient()
+        await db_client.create_tables()
+
+        async with db_client.get_session_context() as session:
+            project = Project(
+                secret_key_hmac="test_key_hmac", secret_key_hash_phc="test_key_hash"
+            )
+            session.add(project)
+            await session.flush()
+
+            space = Space(project_id=project.id)
+            session.add(space)
+            await session.flush()
+
+            test_session = Session(project_id=project.id, space_id=space.id)
+            session.add(test_session)
+            await session.flush()
+
+            planning = Task(
+                session_id=test_session.id,
+                project_id=project.id,
+                order=0,
+                data={"task_description": "planning"},
+                is_planning=True,
+            )
+            tasks = [
+                Task(
+                    session_id=test_session.id,
+                    project_id=project.id,
+                    order=i,
+                    data={"task_description": f"Task {i}"},
+                )
+                for i in (1, 2)
+            ]
+            session.add_all([planning] + tasks)
+            await session.flush()
+
+            base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            messages = [
+                Message(
+                    session_id=test_session.id,
+                    role="user",
+                    parts_asset_meta={},
+                    task_id=task_id,
+                )
+                for task_id in (tasks[0].id, tasks[0].id, tasks[0].id, planning.id)
+            ]
+            # newest first, so the order can't come from insertion order
+            for i, m in enumerate(messages):
+                m.created_at = base - timedelta(seconds=i)
+            session.add_all(messages)
+            await session.flush()
+
+            current, _ = (await fetch_current_tasks(session, test_session.id)).unpack()
+            assert [t.order for t in current] == [1, 2]
+            assert current[0].raw_message_ids == [m.id for m in messages[2::-1]]
+            assert current[1].raw_message_ids == []
+
+            task, _ = (await fetch_task(session, tasks[0].id)).unpack()
+            assert task.raw_message_ids == current[0].raw_message_ids
+
+            planning_schema, _ = (
+                await fetch_planning_task(session, test_session.id)
+            ).unpack()
+            assert planning_schema.id == planning.id
+            assert planning_schema.raw_message_ids == [messages[3].id]
+
+            await session.delete(project)